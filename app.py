@@ -5,18 +5,31 @@ Modern web interface for SRT file translation with on-demand SpaCy model managem
 """
 
 import os
-import json
-import uuid
+import queue
+import asyncio
+import hashlib
+import secrets
+import tempfile
 import threading
 import webbrowser
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, Response, send_file, redirect, url_for
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, Response, send_file, redirect, url_for
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
+from markupsafe import Markup, escape
+from cachetools import TTLCache
+import orjson
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import BaseTarget, SHA256Target
 
 # Project modules
-from parser import parse_srt, save_srt
-from engine import merge_sentences_with_manager, smart_split
-from translator import DeepLTranslator, TranslationConfig
+from parser import iter_srt, count_srt_blocks, save_srt
+from engine import get_nlp_with_manager, iter_merged_sentences, smart_split, preload as preload_models
+from translator import (DeepLTranslator, TranslationConfig, AIOHTTP_AVAILABLE, create_session, cache_scope,
+                        invalidate_config_cache)
+from translation_cache import get_translation_cache
 from backend.model_manager import get_model_manager
 from backend.language_data import PRESET_MODELS, ALL_LANGUAGES
 
@@ -25,24 +38,41 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['OUTPUT_FOLDER'] = 'outputs'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 
+# Behind nginx/Apache: let the front server send files via X-Sendfile (zero-copy sendfile(2))
+app.use_x_sendfile = bool(os.environ.get('X_SENDFILE'))
+
+# Upload read size (hashing + writing happen in the same pass)
+CHUNK_SIZE = 8 * 1024 * 1024
+
 # Create folders
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 
 
+def _remove_quietly(path):
+    """Remove a file, returning True on success."""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
 def cleanup_temp_files():
     """Clean up temp files from previous session."""
-    count = 0
+    paths = []
     for folder in [app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']]:
         if os.path.exists(folder):
-            for filename in os.listdir(folder):
-                filepath = os.path.join(folder, filename)
-                try:
-                    if os.path.isfile(filepath):
-                        os.remove(filepath)
-                        count += 1
-                except Exception:
-                    pass
+            # scandir carries file type in the dirent, no extra stat per entry
+            with os.scandir(folder) as entries:
+                paths.extend(e.path for e in entries if e.is_file())
+    
+    if not paths:
+        return
+    
+    # Unlinks are I/O bound; run them concurrently so startup isn't blocked on slow disks
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        count = sum(executor.map(_remove_quietly, paths))
     if count > 0:
         print(f"  🧹 Cleaned up {count} old files.")
 
@@ -50,8 +80,82 @@ def cleanup_temp_files():
 # Clean up on startup
 cleanup_temp_files()
 
-# Job tracking
-translation_jobs = {}
+def remove_job_files(job):
+    """Delete a job's uploaded and translated files (if present)."""
+    for path in (job.get('filepath'), job.get('output_path')):
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Job states in which no translation thread is using the job's files
+IDLE_JOB_STATUSES = ('uploaded', 'completed', 'error')
+
+
+class JobStore(TTLCache):
+    """
+    Bounded job registry: jobs expire after JOB_TTL seconds (or when more than
+    MAX_JOBS exist) and their files are removed from disk on eviction.
+    Running jobs never expire; they are re-inserted with a fresh TTL.
+    Every job that leaves the registry is flagged with job['evicted'].
+    """
+    
+    def expire(self, time=None):
+        expired = []
+        # cachetools >= 5.3 returns the expired (key, value) pairs
+        for key, job in super().expire(time):
+            if job['status'] in IDLE_JOB_STATUSES:
+                job['evicted'] = True
+                remove_job_files(job)
+                expired.append((key, job))
+            else:
+                # Still translating: keep /status and /download working
+                self[key] = job
+        return expired
+    
+    def popitem(self):
+        key, job = super().popitem()
+        job['evicted'] = True
+        # Never pull files from under a running translation;
+        # run_translation cleans up after itself once it notices the eviction
+        if job['status'] in IDLE_JOB_STATUSES:
+            remove_job_files(job)
+        return key, job
+
+
+# Job tracking (shared by request threads and translation threads)
+MAX_JOBS = 1024
+JOB_TTL = 3600
+translation_jobs = JobStore(maxsize=MAX_JOBS, ttl=JOB_TTL)
+_jobs_lock = threading.RLock()
+
+
+# Language detection per upload content (full SHA-256 -> (lang, confidence)),
+# so re-uploading the same file skips detection; guarded by _jobs_lock
+_upload_detections = TTLCache(maxsize=MAX_JOBS, ttl=JOB_TTL)
+
+
+def get_job(job_id):
+    """Look up a job under the registry lock; None if unknown or expired."""
+    with _jobs_lock:
+        translation_jobs.expire()  # Re-arms running jobs before the lookup
+        return translation_jobs.get(job_id)
+
+# Concurrent DeepL batch requests per job (keep within the API's concurrency limit)
+TRANSLATE_WORKERS = int(os.environ.get('DEEPL_MAX_WORKERS', 6))
+
+# Seconds between SSE keepalive comments when a job is idle
+SSE_KEEPALIVE = 15
+
+
+def update_job(job, **changes):
+    """Apply changes to a job and wake up any progress streams waiting on it."""
+    with job['changed']:
+        job.update(changes)
+        job['version'] += 1
+        job['changed'].notify_all()
 
 # DeepL supported languages (target languages)
 DEEPL_LANGUAGES = {
@@ -89,6 +193,28 @@ DEEPL_LANGUAGES = {
     "UK": "Українська",
 }
 
+# Static language list, serialized once at import
+_LANGUAGES_JSON = orjson.dumps(DEEPL_LANGUAGES)
+_LANGUAGES_ETAG = hashlib.md5(_LANGUAGES_JSON).hexdigest()
+
+
+def render_options(languages, selected=None):
+    """Pre-render <option> tags once so templates don't loop over the dict per request."""
+    return Markup('\n'.join(
+        f'<option value="{escape(code)}"{" selected" if code == selected else ""}>{escape(name)}</option>'
+        for code, name in languages.items()
+    ))
+
+
+# Static <select> contents, rendered once at import
+TARGET_LANG_OPTIONS = render_options(DEEPL_LANGUAGES, selected='TR')
+ALL_LANG_OPTIONS = render_options(ALL_LANGUAGES)
+
+
+def ojson(data):
+    """JSON response serialized with orjson (faster than jsonify, native UTF-8)."""
+    return Response(orjson.dumps(data), mimetype='application/json')
+
 
 # ============================================================
 # SETUP CHECK MIDDLEWARE
@@ -127,7 +253,7 @@ def setup():
     return render_template(
         'setup.html',
         preset_models=PRESET_MODELS,
-        all_languages=ALL_LANGUAGES
+        lang_options=ALL_LANG_OPTIONS
     )
 
 
@@ -143,7 +269,7 @@ def settings():
     return render_template(
         'settings.html',
         models=manager.get_installed_models(),
-        all_languages=ALL_LANGUAGES
+        lang_options=ALL_LANG_OPTIONS
     )
 
 
@@ -159,15 +285,21 @@ def index():
     
     return render_template(
         'index.html',
-        languages=DEEPL_LANGUAGES,
+        lang_options=TARGET_LANG_OPTIONS,
         active_model=active_model
     )
 
 
 @app.route('/languages')
 def get_languages():
-    """Return supported languages."""
-    return jsonify(DEEPL_LANGUAGES)
+    """Return supported languages (pre-serialized, cacheable)."""
+    response = Response(
+        _LANGUAGES_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
+    response.set_etag(_LANGUAGES_ETAG)
+    return response.make_conditional(request)
 
 
 # ============================================================
@@ -183,15 +315,15 @@ def api_install_model():
     lang_code = data.get('lang_code', '')
     
     if not all([install_cmd, model_name, lang_code]):
-        return jsonify({'success': False, 'error': 'Missing required fields'}), 400
+        return ojson({'success': False, 'error': 'Missing required fields'}), 400
     
     manager = get_model_manager()
     result = manager.install_model(install_cmd, model_name, lang_code)
     
     if result['success']:
-        return jsonify(result)
+        return ojson(result)
     else:
-        return jsonify(result), 400
+        return ojson(result), 400
 
 
 @app.route('/api/remove-model', methods=['POST'])
@@ -201,15 +333,15 @@ def api_remove_model():
     model_name = data.get('model_name', '')
     
     if not model_name:
-        return jsonify({'success': False, 'error': 'Model name required'}), 400
+        return ojson({'success': False, 'error': 'Model name required'}), 400
     
     manager = get_model_manager()
     result = manager.remove_model(model_name)
     
     if result.get('success'):
-        return jsonify(result)
+        return ojson(result)
     else:
-        return jsonify(result), 400
+        return ojson(result), 400
 
 
 @app.route('/api/detect-language', methods=['POST'])
@@ -219,12 +351,12 @@ def api_detect_language():
     text = data.get('text', '')
     
     if not text:
-        return jsonify({'lang': 'unknown', 'confidence': 0})
+        return ojson({'lang': 'unknown', 'confidence': 0})
     
     manager = get_model_manager()
     lang, confidence = manager.detect_language(text)
     
-    return jsonify({
+    return ojson({
         'lang': lang,
         'confidence': confidence,
         'language_name': ALL_LANGUAGES.get(lang, lang.upper())
@@ -236,7 +368,7 @@ def api_model_status():
     """Get current model status."""
     manager = get_model_manager()
     
-    return jsonify({
+    return ojson({
         'setup_complete': manager.is_setup_complete(),
         'installed_models': manager.get_installed_models(),
         'active_model': manager.get_active_model_info()
@@ -250,21 +382,31 @@ def api_model_status():
 CONFIG_FILE = 'config.json'
 
 
+# Parsed config.json, kept in memory; refreshed by save_config()
+_config_cache = {'data': None}
+
+
 def load_config():
-    """Load config from JSON file."""
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    """Load config from JSON file (read from disk only once)."""
+    if _config_cache['data'] is None:
+        data = {}
+        if os.path.exists(CONFIG_FILE):
+            try:
+                with open(CONFIG_FILE, 'rb') as f:
+                    data = orjson.loads(f.read())
+            except:
+                data = {}
+        _config_cache['data'] = data
+    # Callers modify the result before saving; hand out a copy
+    return dict(_config_cache['data'])
 
 
 def save_config(config):
-    """Save config to JSON file."""
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2)
+    """Save config to JSON file and update the in-memory copy."""
+    with open(CONFIG_FILE, 'wb') as f:
+        f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    _config_cache['data'] = dict(config)
+    invalidate_config_cache()  # DeepLTranslator() reads the key through its own cache
 
 
 def get_api_key():
@@ -281,7 +423,7 @@ def get_config():
     masked_key = ''
     if has_key:
         masked_key = api_key[:8] + '...' + api_key[-4:] if len(api_key) > 12 else '***'
-    return jsonify({
+    return ojson({
         'has_api_key': has_key,
         'masked_key': masked_key
     })
@@ -294,13 +436,13 @@ def save_api_config():
     api_key = data.get('api_key', '').strip()
     
     if not api_key:
-        return jsonify({'error': 'API key cannot be empty'}), 400
+        return ojson({'error': 'API key cannot be empty'}), 400
     
     config = load_config()
     config['deepl_api_key'] = api_key
     save_config(config)
     
-    return jsonify({'message': 'API key saved', 'success': True})
+    return ojson({'message': 'API key saved', 'success': True})
 
 
 @app.route('/api/config', methods=['DELETE'])
@@ -311,44 +453,121 @@ def delete_api_config():
         del config['deepl_api_key']
         save_config(config)
     
-    return jsonify({'message': 'API key removed', 'success': True})
+    return ojson({'message': 'API key removed', 'success': True})
 
 
 # ============================================================
 # FILE UPLOAD & TRANSLATION
 # ============================================================
 
+class UploadTarget(BaseTarget):
+    """
+    Streams the uploaded file part to disk. Unlike FileTarget it records whether
+    the part was completely received and can close its handle after an aborted body
+    (on_finish never runs then; Windows refuses to delete open files).
+    """
+    
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.completed = False
+        self._file = None
+    
+    @property
+    def incomplete(self):
+        """Body ended inside the file part (client disconnect / truncated request)."""
+        return self._file is not None and not self.completed
+    
+    def on_start(self):
+        self._file = open(self.filename, 'wb')
+    
+    def on_data_received(self, chunk):
+        self._file.write(chunk)
+    
+    def on_finish(self):
+        self._file.close()
+        self.completed = True
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _discard_upload(file_target, tmp_path):
+    """Remove a rejected upload (closing its file first)."""
+    file_target.close()
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Upload SRT file."""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file found'}), 400
+    # Parse multipart body straight from the WSGI stream (no werkzeug spooling);
+    # the file is written to a temp path and hashed in the same pass
+    fd, tmp_path = tempfile.mkstemp(dir=app.config['UPLOAD_FOLDER'], suffix='.part')
+    os.close(fd)
+    file_target = UploadTarget(tmp_path)
+    sha_target = SHA256Target()
+    
+    try:
+        form_parser = StreamingFormDataParser(headers=request.headers)
+        form_parser.register('file', file_target)
+        form_parser.register('file', sha_target)
+        while chunk := request.stream.read(CHUNK_SIZE):
+            form_parser.data_received(chunk)
+        if file_target.incomplete:
+            raise ValueError('Incomplete upload')
+    except RequestEntityTooLarge:
+        _discard_upload(file_target, tmp_path)
+        raise  # 413 from MAX_CONTENT_LENGTH
+    except Exception:
+        _discard_upload(file_target, tmp_path)
+        return ojson({'error': 'Invalid upload'}), 400
+    
+    if file_target.multipart_filename is None:
+        _discard_upload(file_target, tmp_path)
+        return ojson({'error': 'No file found'}), 400
     
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+    if file_target.multipart_filename == '':
+        _discard_upload(file_target, tmp_path)
+        return ojson({'error': 'No file selected'}), 400
     
-    if not file.filename.lower().endswith('.srt'):
-        return jsonify({'error': 'Only SRT files are accepted'}), 400
+    if not file_target.multipart_filename.lower().endswith('.srt'):
+        _discard_upload(file_target, tmp_path)
+        return ojson({'error': 'Only SRT files are accepted'}), 400
+    
+    filename = secure_filename(file_target.multipart_filename)
+    content_hash = sha_target.value
+    # Every upload gets its own job, so a job another client is using never changes
+    job_id = secrets.token_hex(8)
     
-    # Save with unique ID
-    job_id = str(uuid.uuid4())[:8]
-    filename = secure_filename(file.filename)
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_{filename}")
-    file.save(filepath)
+    os.replace(tmp_path, filepath)
     
-    # Read file content for language detection
-    try:
-        with open(filepath, 'r', encoding='utf-8-sig') as f:
-            content = f.read()
-        # Get first 2000 chars for detection
-        sample_text = content[:2000]
-    except:
-        sample_text = ""
-    
-    # Detect language
     manager = get_model_manager()
-    detected_lang, confidence = manager.detect_language(sample_text)
+    
+    # Same content uploaded before: reuse its language detection
+    with _jobs_lock:
+        detection = _upload_detections.get(content_hash)
+    
+    if detection is None:
+        # Read file content for language detection
+        try:
+            with open(filepath, 'r', encoding='utf-8-sig') as f:
+                # Get first 2000 chars for detection
+                sample_text = f.read(2000)
+        except:
+            sample_text = ""
+        
+        # Detect language
+        detection = manager.detect_language(sample_text)
+        with _jobs_lock:
+            _upload_detections[content_hash] = detection
+    
+    detected_lang, confidence = detection
     
     # Check if we have a matching model
     installed_models = manager.get_installed_models()
@@ -377,13 +596,16 @@ def upload_file():
             active_model_lang = 'Rule-based'
     
     # Create job status
-    translation_jobs[job_id] = {
+    job = {
         'status': 'uploaded',
         'progress': 0,
+        'version': 0,
+        'changed': threading.Condition(),
         'filename': filename,
         'filepath': filepath,
         'output_path': None,
         'error': None,
+        # Detected once per file; authoritative for every later stage of this job
         'detected_lang': detected_lang,
         'lang_confidence': confidence,
         'has_matching_model': has_matching_model,
@@ -396,11 +618,11 @@ def upload_file():
     # Set warning if mismatch (different message for multilingual)
     if not has_matching_model and detected_lang != 'unknown':
         if is_multilingual:
-            translation_jobs[job_id]['warning'] = f"Using universal model for {ALL_LANGUAGES.get(detected_lang, detected_lang)}. Works well for most languages."
+            job['warning'] = f"Using universal model for {ALL_LANGUAGES.get(detected_lang, detected_lang)}. Works well for most languages."
         else:
-            translation_jobs[job_id]['warning'] = f"No {ALL_LANGUAGES.get(detected_lang, detected_lang)} model installed. Using {active_model_name} as fallback."
+            job['warning'] = f"No {ALL_LANGUAGES.get(detected_lang, detected_lang)} model installed. Using {active_model_name} as fallback."
     
-    return jsonify({
+    upload_info = {
         'job_id': job_id,
         'filename': filename,
         'message': 'File uploaded',
@@ -411,8 +633,13 @@ def upload_file():
         'is_multilingual': is_multilingual,
         'active_model_name': active_model_name,
         'active_model_lang': active_model_lang,
-        'warning': translation_jobs[job_id].get('warning')
-    })
+        'warning': job.get('warning')
+    }
+    
+    with _jobs_lock:
+        translation_jobs[job_id] = job
+    
+    return ojson(upload_info)
 
 
 @app.route('/translate', methods=['POST'])
@@ -423,13 +650,12 @@ def start_translation():
     target_lang = data.get('target_lang', 'TR')
     output_filename = data.get('output_filename', None)
     
-    if job_id not in translation_jobs:
-        return jsonify({'error': 'Invalid job ID'}), 400
-    
-    job = translation_jobs[job_id]
+    job = get_job(job_id)
+    if job is None:
+        return ojson({'error': 'Invalid job ID'}), 400
     
     if job['status'] not in ['uploaded', 'error']:
-        return jsonify({'error': 'Job already processing or completed'}), 400
+        return ojson({'error': 'Job already processing or completed'}), 400
     
     # Output filename
     if not output_filename:
@@ -439,10 +665,12 @@ def start_translation():
     output_path = os.path.join(app.config['OUTPUT_FOLDER'], f"{job_id}_{output_filename}")
     job['output_path'] = output_path
     job['output_filename'] = output_filename
-    job['status'] = 'processing'
-    job['progress'] = 0
+    update_job(job, status='processing', progress=0)
+    with _jobs_lock:
+        if not job.get('evicted'):
+            translation_jobs[job_id] = job  # TTL counts from the start of the run
     
-    # Use detected language for SpaCy model selection
+    # Use detected language for SpaCy model selection (never re-detected downstream)
     source_lang = job.get('detected_lang', 'en')
     
     # Start translation in background
@@ -453,103 +681,272 @@ def start_translation():
     thread.daemon = True
     thread.start()
     
-    return jsonify({'message': 'Translation started', 'job_id': job_id})
+    return ojson({'message': 'Translation started', 'job_id': job_id})
+
+
+# Bounded queues between pipeline stages
+PIPELINE_QUEUE_SIZE = 32
+_STAGE_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside a stage when another stage of the same job failed."""
+
+
+def _stage_put(q, item, abort):
+    """Put an item on a bounded stage queue, giving up if the pipeline aborted."""
+    while not abort.is_set():
+        try:
+            q.put(item, timeout=0.2)
+            return
+        except queue.Full:
+            pass
+    raise PipelineAborted()
+
+
+def _stage_items(q, abort):
+    """Yield items from a stage queue until the upstream stage is done."""
+    while True:
+        try:
+            item = q.get(timeout=0.2)
+        except queue.Empty:
+            if abort.is_set():
+                raise PipelineAborted()
+            continue
+        if item is _STAGE_DONE:
+            return
+        yield item
+
+
+def _stage_batches(q, abort, size, linger=0.2):
+    """Like _stage_items, but groups items into lists of up to `size`.
+    A partial batch is released once the queue has been idle for `linger` seconds."""
+    batch = []
+    while True:
+        try:
+            item = q.get(timeout=linger)
+        except queue.Empty:
+            if abort.is_set():
+                raise PipelineAborted()
+            if batch:
+                yield batch
+                batch = []
+            continue
+        if item is _STAGE_DONE:
+            if batch:
+                yield batch
+            return
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+
+def _start_stage(work, out_q, errors, abort):
+    """Run a pipeline stage in a daemon thread; signal completion or abort."""
+    def runner():
+        try:
+            work()
+            _stage_put(out_q, _STAGE_DONE, abort)
+        except PipelineAborted:
+            pass
+        except Exception as e:
+            errors.append(e)
+            abort.set()
+    
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    return thread
 
 
 def run_translation(job_id: str, input_path: str, output_path: str, source_lang: str, target_lang: str):
-    """Run translation in background."""
-    job = translation_jobs[job_id]
+    """
+    Run translation in background.
+    
+    Stages overlap: parse+merge -> translate -> split -> collect, connected by
+    bounded queues, so translation starts with the first closed sentence and
+    splitting starts with the first translated batch.
+    
+    source_lang is the language detected at upload time; it is passed as-is to
+    every stage instead of being re-detected per sentence.
+    """
+    job = get_job(job_id)
     
     try:
-        # 1. Parse SRT (10%)
-        job['progress'] = 5
-        job['status'] = 'parsing'
-        blocks = parse_srt(input_path)
-        job['progress'] = 10
+        detected_lang = job.get('detected_lang', source_lang)
+        if source_lang != detected_lang:
+            raise ValueError(
+                f"Source language '{source_lang}' does not match the language detected at upload ('{detected_lang}')"
+            )
         
-        # 2. Merge sentences (20%) - Use ModelManager
-        job['status'] = 'merging'
-        merged, model_info, is_fallback = merge_sentences_with_manager(blocks, source_lang)
-        job['progress'] = 20
+        update_job(job, status='parsing', progress=5)
+        total_blocks = max(count_srt_blocks(input_path), 1)
         
-        # Store model info
-        job['used_model'] = model_info
-        job['model_fallback'] = is_fallback
+        # Select SpaCy model (ModelManager)
+        update_job(job, status='merging')
+        nlp, model_info, is_fallback = get_nlp_with_manager(source_lang)
+        update_job(job, status='translating', progress=10, used_model=model_info, model_fallback=is_fallback)
         
-        # 3. Translate (20% -> 80%)
-        job['status'] = 'translating'
         translator = DeepLTranslator()
         config = TranslationConfig(target_lang=target_lang)
+        cache = get_translation_cache()
+        scope = cache_scope(config)
+        batch_size = 10
         
-        sentences_to_translate = [m.full_text for m in merged]
-        total_sentences = len(sentences_to_translate)
-        translated_sentences = []
+        merged_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        translated_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        split_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        errors = []
+        abort = threading.Event()
+        blocks = []
         
-        # Batch translation
-        batch_size = 10
-        for i in range(0, total_sentences, batch_size):
-            batch = sentences_to_translate[i:i+batch_size]
-            translated_batch = translator.translate_batch(batch, config)
-            translated_sentences.extend(translated_batch)
+        # Stage 1: parse + merge (blocks streamed into the rolling-window merger)
+        def merge_stage():
+            def parsed_blocks():
+                for block in iter_srt(input_path):
+                    blocks.append(block)
+                    yield block
             
-            progress = 20 + int((i + len(batch)) / total_sentences * 60)
-            job['progress'] = min(progress, 80)
+            for merged_sent in iter_merged_sentences(parsed_blocks(), nlp):
+                _stage_put(merged_q, merged_sent, abort)
+        
+        # Stage 2: translate (cache hits skip the API call, batches run concurrently)
+        translations = {}
+        
+        def translate_chunk(batch):
+            # translate_batch consults the TranslationCache itself
+            return dict(zip(batch, translator.translate_batch(batch, config)))
+        
+        def translate_stage():
+            if AIOHTTP_AVAILABLE:
+                translate_stage_async()
+                return
+            with ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS) as executor:
+                for window in _stage_batches(merged_q, abort, batch_size * TRANSLATE_WORKERS):
+                    # Repeated lines are translated once per job and fanned back out
+                    unique = [s for s in dict.fromkeys(m.full_text for m in window) if s not in translations]
+                    chunks = [unique[i:i+batch_size] for i in range(0, len(unique), batch_size)]
+                    for translated_batch in executor.map(translate_chunk, chunks):
+                        translations.update(translated_batch)
+                    
+                    for merged_sent in window:
+                        _stage_put(translated_q, (merged_sent, translations[merged_sent.full_text]), abort)
+        
+        # One event loop + one keep-alive session per job; batches are awaited together
+        async def translate_chunks(session, chunks):
+            return await asyncio.gather(
+                *(translator.atranslate_batch(session, chunk, config) for chunk in chunks)
+            )
+        
+        def translate_stage_async():
+            loop = asyncio.new_event_loop()
+            session = loop.run_until_complete(create_session(limit=TRANSLATE_WORKERS))
+            try:
+                for window in _stage_batches(merged_q, abort, batch_size * TRANSLATE_WORKERS):
+                    unique = [s for s in dict.fromkeys(m.full_text for m in window) if s not in translations]
+                    translations.update(cache.get_many(unique, scope))
+                    misses = [s for s in unique if s not in translations]
+                    chunks = [misses[i:i+batch_size] for i in range(0, len(misses), batch_size)]
+                    if chunks:
+                        results = loop.run_until_complete(translate_chunks(session, chunks))
+                        fresh = {}
+                        for chunk, translated_batch in zip(chunks, results):
+                            fresh.update(zip(chunk, translated_batch))
+                        cache.put_many(fresh, scope)
+                        translations.update(fresh)
+                    
+                    for merged_sent in window:
+                        _stage_put(translated_q, (merged_sent, translations[merged_sent.full_text]), abort)
+            finally:
+                loop.run_until_complete(session.close())
+                loop.close()
         
-        # 4. Smart split (80% -> 90%)
-        job['status'] = 'splitting'
-        block_translations = {}
+        # Stage 3: smart split back onto source blocks
+        def split_stage():
+            for merged_sent, translated_text in _stage_items(translated_q, abort):
+                split_parts = smart_split(translated_text, merged_sent.char_ratios)
+                for block, part in zip(merged_sent.source_blocks, split_parts):
+                    _stage_put(split_q, (block.index, part), abort)
         
-        for merged_sent, translated_text in zip(merged, translated_sentences):
-            split_parts = smart_split(translated_text, merged_sent.char_ratios)
-            for block, part in zip(merged_sent.source_blocks, split_parts):
-                if block.index in block_translations:
-                    block_translations[block.index] += " " + part
-                else:
-                    block_translations[block.index] = part
+        _start_stage(merge_stage, merged_q, errors, abort)
+        _start_stage(translate_stage, translated_q, errors, abort)
+        _start_stage(split_stage, split_q, errors, abort)
         
-        translated_texts = []
-        for block in blocks:
-            translated_texts.append(block_translations.get(block.index, block.text))
+        # Stage 4: collect split parts (progress follows finished blocks: 10% -> 90%)
+        # Parts are bucketed per block and joined once (no repeated string concat)
+        block_parts = defaultdict(list)
+        try:
+            for block_index, part in _stage_items(split_q, abort):
+                parts = block_parts[block_index]
+                parts.append(part)
+                if len(parts) == 1:
+                    progress = 10 + int(len(block_parts) / total_blocks * 80)
+                    if progress != job['progress']:
+                        update_job(job, progress=min(progress, 90))
+        except PipelineAborted:
+            raise errors[0]
+        finally:
+            # Collecting stopped for any reason: release stages blocked on full queues
+            abort.set()
         
-        job['progress'] = 90
+        translated_texts = [
+            " ".join(block_parts[block.index]) if block.index in block_parts else block.text
+            for block in blocks
+        ]
         
         # 5. Save (90% -> 100%)
-        job['status'] = 'saving'
+        update_job(job, status='saving', progress=90)
         save_srt(blocks, output_path, translated_texts)
         
-        job['progress'] = 100
-        job['status'] = 'completed'
+        update_job(job, status='completed', progress=100)
         
     except Exception as e:
-        job['status'] = 'error'
-        job['error'] = str(e)
+        update_job(job, status='error', error=str(e))
+    
+    finally:
+        # Evicted while running (registry full): nothing can reach its files any more.
+        # A lapsed TTL alone doesn't count; expire() re-arms running jobs.
+        with _jobs_lock:
+            orphaned = job.get('evicted', False)
+        if orphaned:
+            remove_job_files(job)
 
 
 @app.route('/progress/<job_id>')
 def get_progress(job_id):
     """Return job progress (SSE stream)."""
     def generate():
+        job = get_job(job_id)
+        if job is None:
+            yield f"data: {orjson.dumps({'error': 'Job not found'}).decode()}\n\n"
+            return
+        
+        seen_version = -1
+        
         while True:
-            if job_id not in translation_jobs:
-                yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
-                break
+            # Sleep until the job changes; timeout doubles as SSE keepalive
+            with job['changed']:
+                changed = job['changed'].wait_for(
+                    lambda: job['version'] != seen_version, timeout=SSE_KEEPALIVE
+                )
+                seen_version = job['version']
+                data = {
+                    'status': job['status'],
+                    'progress': job['progress'],
+                    'error': job.get('error'),
+                    'warning': job.get('warning'),
+                    'used_model': job.get('used_model'),
+                    'model_fallback': job.get('model_fallback', False)
+                }
             
-            job = translation_jobs[job_id]
-            data = {
-                'status': job['status'],
-                'progress': job['progress'],
-                'error': job.get('error'),
-                'warning': job.get('warning'),
-                'used_model': job.get('used_model'),
-                'model_fallback': job.get('model_fallback', False)
-            }
-            yield f"data: {json.dumps(data)}\n\n"
+            if not changed:
+                yield ": keepalive\n\n"
+                continue
             
-            if job['status'] in ['completed', 'error']:
-                break
+            yield f"data: {orjson.dumps(data).decode()}\n\n"
             
-            import time
-            time.sleep(0.5)
+            if data['status'] in ['completed', 'error']:
+                break
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -557,11 +954,10 @@ def get_progress(job_id):
 @app.route('/status/<job_id>')
 def get_status(job_id):
     """Return job status as JSON."""
-    if job_id not in translation_jobs:
-        return jsonify({'error': 'Job not found'}), 404
-    
-    job = translation_jobs[job_id]
-    return jsonify({
+    job = get_job(job_id)
+    if job is None:
+        return ojson({'error': 'Job not found'}), 404
+    return ojson({
         'status': job['status'],
         'progress': job['progress'],
         'filename': job.get('filename'),
@@ -577,18 +973,21 @@ def get_status(job_id):
 @app.route('/download/<job_id>')
 def download_file(job_id):
     """Download translated file."""
-    if job_id not in translation_jobs:
-        return jsonify({'error': 'Job not found'}), 404
-    
-    job = translation_jobs[job_id]
+    job = get_job(job_id)
+    if job is None:
+        return ojson({'error': 'Job not found'}), 404
     
     if job['status'] != 'completed':
-        return jsonify({'error': 'Translation not completed'}), 400
+        return ojson({'error': 'Translation not completed'}), 400
     
+    # Conditional responses give Range/ETag support, so retries don't re-stream the file
     return send_file(
         job['output_path'],
         as_attachment=True,
-        download_name=job['output_filename']
+        download_name=job['output_filename'],
+        conditional=True,
+        etag=True,
+        max_age=0
     )
 
 
@@ -600,9 +999,9 @@ if __name__ == '__main__':
     import logging
     import socket
     
-    # Silence Flask/Werkzeug logs
-    log = logging.getLogger('werkzeug')
-    log.setLevel(logging.ERROR)
+    # Silence Flask/Werkzeug/Waitress logs
+    for name in ('werkzeug', 'waitress'):
+        logging.getLogger(name).setLevel(logging.ERROR)
     
     # Get LAN IP
     def get_local_ip():
@@ -641,4 +1040,14 @@ if __name__ == '__main__':
     
     threading.Thread(target=open_browser, daemon=True).start()
     
-    app.run(debug=False, host='0.0.0.0', port=5000)
+    # Warm up installed SpaCy models in the background (disk-cached after first run)
+    threading.Thread(target=preload_models, daemon=True).start()
+    
+    # Multi-threaded production server so SSE streams, uploads and downloads
+    # don't block each other; fall back to Werkzeug's server if Waitress is missing
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=5000, threads=16)
@@ -0,0 +1,92 @@
+"""
+_overlap_kernel.py - Native merge/split kernels (Numba)
+
+engine._merge_doc için derlenmiş örtüşme hesabı ve engine.smart_split için
+bölme noktası seçimi. numba kurulu değilse import ImportError verir ve
+engine saf Python sürümlerini kullanır.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(parallel=False, cache=True)
+def overlaps(bs, be, ss, se):
+    """
+    Sıralı blok aralıklarını [bs, be) sıralı cümle aralıklarıyla [ss, se) eşleştirir.
+    
+    Returns:
+        (ptr, idx, contrib): cümle s için örtüşen bloklar idx[ptr[s]:ptr[s+1]],
+        katkı (karakter sayısı) contrib[ptr[s]:ptr[s+1]]
+    """
+    n_sents = ss.shape[0]
+    n_blocks = bs.shape[0]
+    ptr = np.zeros(n_sents + 1, np.int64)
+    # Sıralı ve çakışmayan aralıklarda örtüşme çifti sayısı en fazla S + B
+    idx = np.empty(n_sents + n_blocks, np.int64)
+    contrib = np.empty(n_sents + n_blocks, np.int64)
+    
+    k = 0
+    bi = 0
+    for s in range(n_sents):
+        sent_start = ss[s]
+        sent_end = se[s]
+        
+        while bi < n_blocks and be[bi] <= sent_start:
+            bi += 1
+        
+        j = bi
+        while j < n_blocks and bs[j] < sent_end:
+            overlap = min(be[j], sent_end) - max(bs[j], sent_start)
+            if overlap > 0:
+                idx[k] = j
+                contrib[k] = overlap
+                k += 1
+            j += 1
+        ptr[s + 1] = k
+    
+    return ptr, idx[:k], contrib[:k]
+
+
+@njit(cache=True)
+def split_points(spaces, ratios, total_len):
+    """
+    smart_split bölme noktaları: her oran için hedefe en yakın boşluk
+    (engine._best_split_from_spaces ile aynı kurallar, eşitlikte sol).
+    
+    Args:
+        spaces: Metindeki boşlukların sıralı karakter pozisyonları
+        ratios: Son parça hariç blok oranları
+        total_len: Metin uzunluğu
+        
+    Returns:
+        Her oran için kesim pozisyonu
+    """
+    n_spaces = spaces.shape[0]
+    cuts = np.empty(ratios.shape[0], np.int64)
+    current = 0
+    
+    for r in range(ratios.shape[0]):
+        target = current + int(total_len * ratios[r])
+        search_range = max(10, int((total_len - current) * 0.2))
+        
+        i = np.searchsorted(spaces, target, side='right')
+        left = spaces[i - 1] if i > 0 else -1
+        right = spaces[i] if i < n_spaces else -1
+        
+        if left <= current or left < target - search_range or left >= total_len:
+            left = -1
+        if right >= min(total_len, target + search_range + 1):
+            right = -1
+        
+        if left == -1:
+            best = target if right == -1 else right
+        elif right == -1 or target - left <= right - target:
+            best = left
+        else:
+            best = right
+        
+        cuts[r] = best
+        current = best
+    
+    return cuts
@@ -2,8 +2,11 @@
 language_data.py - SpaCy Model Mappings and Language Data
 
 ISO 639-1 language codes, SpaCy model names, and preset configurations.
+Lookup tables are read-only (MappingProxyType).
 """
 
+from types import MappingProxyType
+
 # Preset models for Setup Wizard (popular languages with speed optimization)
 PRESET_MODELS = [
     {
@@ -44,7 +47,7 @@ PRESET_MODELS = [
 ]
 
 # ISO 639-1 to language name mapping (for Custom dropdown)
-ALL_LANGUAGES = {
+ALL_LANGUAGES = MappingProxyType({
     "xx": "Multilingual / Universal",
     "af": "Afrikaans",
     "ar": "Arabic",
@@ -101,10 +104,10 @@ ALL_LANGUAGES = {
     "vi": "Vietnamese",
     "zh-cn": "Chinese (Simplified)",
     "zh-tw": "Chinese (Traditional)",
-}
+})
 
 # langdetect code to DeepL code mapping
-LANGDETECT_TO_DEEPL = {
+LANGDETECT_TO_DEEPL = MappingProxyType({
     "en": "EN",
     "tr": "TR",
     "de": "DE",
@@ -136,17 +139,25 @@ LANGDETECT_TO_DEEPL = {
     "sl": "SL",
     "sv": "SV",
     "uk": "UK",
-}
+})
+
+# Regional variants sharing one DeepL code, keyed by base code ("zh" -> "ZH")
+# so detectors that return bare codes (e.g. fastText) still resolve
+_DEEPL_BY_PREFIX = MappingProxyType({
+    code.split("-", 1)[0]: deepl
+    for code, deepl in LANGDETECT_TO_DEEPL.items()
+    if "-" in code
+})
 
 # ISO code to SpaCy blank language for sentencizer fallback
-SPACY_BLANK_LANGUAGES = {
+SPACY_BLANK_LANGUAGES = MappingProxyType({
     "en": "en", "tr": "tr", "de": "de", "fr": "fr", "es": "es",
     "it": "it", "pt": "pt", "nl": "nl", "pl": "pl", "ru": "ru",
     "ja": "ja", "zh": "zh", "ko": "ko", "ar": "ar", "bg": "bg",
     "cs": "cs", "da": "da", "el": "el", "et": "et", "fi": "fi",
     "hu": "hu", "id": "id", "lt": "lt", "lv": "lv", "nb": "nb",
     "ro": "ro", "sk": "sk", "sl": "sl", "sv": "sv", "uk": "uk",
-}
+})
 
 
 def get_language_name(iso_code: str) -> str:
@@ -156,4 +167,8 @@ def get_language_name(iso_code: str) -> str:
 
 def get_deepl_code(langdetect_code: str) -> str:
     """Convert langdetect code to DeepL API code."""
-    return LANGDETECT_TO_DEEPL.get(langdetect_code, langdetect_code.upper())
+    return (
+        LANGDETECT_TO_DEEPL.get(langdetect_code)
+        or _DEEPL_BY_PREFIX.get(langdetect_code.split("-", 1)[0])
+        or langdetect_code.upper()
+    )
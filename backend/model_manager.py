@@ -6,21 +6,55 @@ Uses langdetect for automatic source language detection.
 """
 
 import os
+import gc
 import sys
-import json
 import re
+import shutil
+import hashlib
+import queue
+import threading
 import subprocess
+from collections import OrderedDict, deque
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any
+import orjson
 import spacy
-from spacy.util import is_package
+from spacy.util import is_package, get_package_version
+
+# langdetect is imported on first detection (its profiles are ~1 MB);
+# None = not tried yet, then True/False
+LANGDETECT_AVAILABLE: Optional[bool] = None
+_detect = None
+_langdetect_lock = threading.Lock()
+
+
+def _get_detector():
+    """Import langdetect and load its profiles once; returns detect() or None."""
+    global LANGDETECT_AVAILABLE, _detect
+    if LANGDETECT_AVAILABLE is None:
+        with _langdetect_lock:
+            if LANGDETECT_AVAILABLE is None:
+                try:
+                    from langdetect import detect, DetectorFactory
+                    from langdetect.detector_factory import init_factory
+                    # Make langdetect deterministic
+                    DetectorFactory.seed = 0
+                    init_factory()  # Load profiles here, not racing inside the first detect()
+                    _detect = detect
+                    LANGDETECT_AVAILABLE = True
+                except ImportError:
+                    LANGDETECT_AVAILABLE = False
+    return _detect
 
 try:
-    from langdetect import detect, DetectorFactory
-    # Make langdetect deterministic
-    DetectorFactory.seed = 0
-    LANGDETECT_AVAILABLE = True
+    import fasttext
+    FASTTEXT_AVAILABLE = True
 except ImportError:
-    LANGDETECT_AVAILABLE = False
+    FASTTEXT_AVAILABLE = False
+
+# fastText language-ID model (https://fasttext.cc/docs/en/language-identification.html)
+LID_MODEL_PATH = os.environ.get("SRT_LID_MODEL", "lid.176.ftz")
 
 from backend.language_data import (
     PRESET_MODELS, 
@@ -29,6 +63,114 @@ from backend.language_data import (
     get_language_name
 )
 
+# Components never used for sentence merging (only doc.sents is consumed)
+SENTENCE_ONLY_EXCLUDE = [
+    "tagger", "morphologizer", "lemmatizer", "trainable_lemmatizer",
+    "attribute_ruler", "ner", "entity_ruler", "textcat", "textcat_multilabel",
+]
+
+
+# Trimmed pipelines saved here so later boots skip the excluded components
+MODEL_CACHE_DIR = Path(os.environ.get(
+    "SRT_MODEL_CACHE", Path.home() / ".cache" / "srt-smart-translator"
+))
+
+
+def _model_cache_path(model_name: str, exclude: List[str]) -> Optional[Path]:
+    """
+    Disk cache location for a trimmed model, or None if it can't be versioned.
+    
+    The name embeds the SpaCy version plus an md5 of the package version and
+    exclude list, so upgrading either one invalidates the cached copy.
+    """
+    version = get_package_version(model_name)
+    if version is None:
+        return None
+    
+    digest = hashlib.md5(f"{version}|{','.join(sorted(exclude))}".encode()).hexdigest()[:12]
+    return MODEL_CACHE_DIR / f"{model_name}-{spacy.__version__}-{digest}"
+
+
+def clear_model_cache(model_name: str) -> None:
+    """Delete every cached copy of the given model."""
+    if MODEL_CACHE_DIR.is_dir():
+        for path in MODEL_CACHE_DIR.glob(f"{model_name}-*"):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_sentence_model(model_name: str, exclude: Optional[List[str]] = None) -> spacy.Language:
+    """
+    Load a SpaCy model with only the components needed for sentence boundaries.
+    
+    The trimmed pipeline is written to MODEL_CACHE_DIR on first load and
+    loaded from there afterwards.
+    
+    Args:
+        model_name: Installed SpaCy package name
+        exclude: Components to skip (defaults to SENTENCE_ONLY_EXCLUDE)
+        
+    Returns:
+        SpaCy pipeline that sets doc.sents
+    """
+    if exclude is None:
+        exclude = SENTENCE_ONLY_EXCLUDE
+    
+    cache_path = _model_cache_path(model_name, exclude)
+    if cache_path is not None and (cache_path / "config.cfg").is_file():
+        try:
+            return spacy.load(cache_path)
+        except Exception:
+            shutil.rmtree(cache_path, ignore_errors=True)  # Corrupt copy, rebuild below
+    
+    nlp = spacy.load(model_name, exclude=exclude)
+    
+    # Pipelines without parser/senter (e.g. NER-only models) still need boundaries
+    if not any(nlp.has_pipe(name) for name in ("parser", "senter", "sentencizer")):
+        if "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+        else:
+            nlp.add_pipe("sentencizer")
+    
+    if cache_path is not None:
+        # Write to a temp dir and rename so a concurrent reader never sees half a model
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            nlp.to_disk(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    
+    return nlp
+
+
+@lru_cache(maxsize=64)
+def _blank_sentencizer(spacy_lang: str) -> spacy.Language:
+    """Build (once per language) a blank pipeline with a sentencizer."""
+    try:
+        nlp = spacy.blank(spacy_lang)
+    except Exception:
+        nlp = spacy.blank("xx")
+    
+    nlp.add_pipe("sentencizer")
+    print(f"  ✓ Created sentencizer for: {spacy_lang}")
+    return nlp
+
+
+def create_sentencizer(lang_code: str) -> spacy.Language:
+    """
+    Create a rule-based sentencizer for the given language.
+    
+    Accepts ISO codes ('en') as well as DeepL codes ('EN-US', 'PT-BR').
+    Unknown languages use the multi-language blank pipeline. Pipelines are
+    cached per SpaCy language, so repeated calls (e.g. under --serve) are free.
+    """
+    return _blank_sentencizer(SPACY_BLANK_LANGUAGES.get(lang_code.lower().split("-")[0], "xx"))
+
+
+# Shell operators rejected in install commands (multi-char operators first)
+_DANGEROUS_SHELL_RE = re.compile(r"&&|\|\||\$\(|\$\{|[;|$`><\n\r]")
+
 
 class ModelManager:
     """
@@ -44,7 +186,14 @@ class ModelManager:
     CONFIG_FILE = "models.json"
     
     def __init__(self):
-        self._loaded_models: Dict[str, spacy.Language] = {}
+        # LRU of loaded pipelines; each model can hold hundreds of MB
+        self._loaded_models: "OrderedDict[str, spacy.Language]" = OrderedDict()
+        self._max_models = int(os.environ.get("SRT_MAX_LOADED_MODELS", 3))
+        # Guards the LRU (job threads, preload thread and request threads share it);
+        # held across a load so two threads never load the same model twice
+        self._models_lock = threading.RLock()
+        self._lid_model = None  # fastText model, loaded on first detection
+        self._lid_lock = threading.Lock()
         self._config: Dict[str, Any] = {}
         self._load_config()
     
@@ -52,17 +201,17 @@ class ModelManager:
         """Load models configuration from JSON file."""
         if os.path.exists(self.CONFIG_FILE):
             try:
-                with open(self.CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.CONFIG_FILE, 'rb') as f:
+                    self._config = orjson.loads(f.read())
+            except (orjson.JSONDecodeError, IOError):
                 self._config = {"models": []}
         else:
             self._config = {"models": []}
     
     def _save_config(self) -> None:
         """Save models configuration to JSON file."""
-        with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self._config, f, indent=2, ensure_ascii=False)
+        with open(self.CONFIG_FILE, 'wb') as f:
+            f.write(orjson.dumps(self._config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     def is_setup_complete(self) -> bool:
         """Check if initial setup has been completed."""
@@ -77,27 +226,73 @@ class ModelManager:
         models = self.get_installed_models()
         return models[0] if models else None
     
+    def _get_lid_model(self):
+        """Load the fastText language-ID model once; False if unavailable."""
+        if self._lid_model is None:
+            with self._lid_lock:
+                if self._lid_model is None:
+                    lid_model = False
+                    if FASTTEXT_AVAILABLE and os.path.isfile(LID_MODEL_PATH):
+                        try:
+                            lid_model = fasttext.load_model(LID_MODEL_PATH)
+                        except Exception as e:
+                            print(f"  ✗ Failed to load {LID_MODEL_PATH}: {e}")
+                    self._lid_model = lid_model
+        return self._lid_model
+    
     def detect_language(self, text: str) -> Tuple[str, float]:
         """
         Detect the language of the given text.
         
+        Uses fastText (lid.176.ftz) when available, otherwise langdetect.
+        
         Returns:
             Tuple of (iso_code, confidence) or ("unknown", 0.0) if detection fails
         """
-        if not LANGDETECT_AVAILABLE:
-            return ("unknown", 0.0)
+        return self.detect_language_batch([text])[0]
+    
+    def detect_language_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Detect the language of several texts (a single fastText call).
+        
+        Returns:
+            List of (iso_code, confidence) in input order
+        """
+        results = [("unknown", 0.0)] * len(texts)
         
         # Need enough text for reliable detection
-        if len(text.strip()) < 20:
-            return ("unknown", 0.0)
+        indices = [i for i, text in enumerate(texts) if len(text.strip()) >= 20]
+        if not indices:
+            return results
         
-        try:
-            detected = detect(text)
-            # langdetect doesn't provide confidence directly, estimate based on text length
-            confidence = min(0.95, 0.5 + len(text) / 1000)
-            return (detected, confidence)
-        except Exception:
-            return ("unknown", 0.0)
+        lid_model = self._get_lid_model()
+        if lid_model:
+            try:
+                # fastText predicts line by line, so newlines must be removed
+                labels, probs = lid_model.predict([texts[i].replace("\n", " ") for i in indices], k=1)
+            except Exception as e:
+                # e.g. fasttext's predict() raising ValueError under numpy>=2;
+                # such failures are persistent, so stop using fastText
+                print(f"  ✗ fastText detection failed, falling back to langdetect: {e}")
+                self._lid_model = False
+            else:
+                for i, label, prob in zip(indices, labels, probs):
+                    results[i] = (label[0].replace("__label__", ""), min(float(prob[0]), 1.0))
+                return results
+        
+        detect = _get_detector()
+        if detect is None:
+            return results
+        
+        for i in indices:
+            try:
+                detected = detect(texts[i])
+                # langdetect doesn't provide confidence directly, estimate based on text length
+                confidence = min(0.95, 0.5 + len(texts[i]) / 1000)
+                results[i] = (detected, confidence)
+            except Exception:
+                pass
+        return results
     
     def get_model_for_language(self, lang_code: str) -> Tuple[spacy.Language, str, bool]:
         """
@@ -141,34 +336,34 @@ class ModelManager:
         nlp = self._create_sentencizer(lang_code)
         return (nlp, f"sentencizer ({lang_code})", True)
     
-    def _load_model(self, model_name: str) -> Optional[spacy.Language]:
-        """Load a SpaCy model with caching."""
-        if model_name in self._loaded_models:
-            return self._loaded_models[model_name]
-        
-        try:
-            if is_package(model_name):
-                nlp = spacy.load(model_name)
-                self._loaded_models[model_name] = nlp
-                print(f"  ✓ Loaded model: {model_name}")
+    def _load_model(self, model_name: str, exclude: Optional[List[str]] = None) -> Optional[spacy.Language]:
+        """Load a SpaCy model with caching (unused components excluded)."""
+        with self._models_lock:
+            nlp = self._loaded_models.get(model_name)
+            if nlp is not None:
+                self._loaded_models.move_to_end(model_name)
                 return nlp
-        except Exception as e:
-            print(f"  ✗ Failed to load {model_name}: {e}")
+            
+            try:
+                if is_package(model_name):
+                    nlp = load_sentence_model(model_name, exclude)
+                    self._loaded_models[model_name] = nlp
+                    print(f"  ✓ Loaded model: {model_name}")
+                    
+                    # Evict least recently used models over the cap
+                    while len(self._loaded_models) > self._max_models:
+                        evicted, _ = self._loaded_models.popitem(last=False)
+                        print(f"  ↺ Unloaded model: {evicted}")
+                        gc.collect()
+                    return nlp
+            except Exception as e:
+                print(f"  ✗ Failed to load {model_name}: {e}")
         
         return None
     
     def _create_sentencizer(self, lang_code: str) -> spacy.Language:
         """Create a rule-based sentencizer for the given language."""
-        spacy_lang = SPACY_BLANK_LANGUAGES.get(lang_code, "xx")
-        
-        try:
-            nlp = spacy.blank(spacy_lang)
-        except Exception:
-            nlp = spacy.blank("xx")
-        
-        nlp.add_pipe("sentencizer")
-        print(f"  ✓ Created sentencizer for: {lang_code}")
-        return nlp
+        return create_sentencizer(lang_code)
     
     # Turkish model URL - uses loose versioning compatible with SpaCy 3.8+
     TURKISH_MODEL_URL = "https://huggingface.co/turkish-nlp-suite/tr_core_news_lg/resolve/main/tr_core_news_lg-1.0-py3-none-any.whl"
@@ -200,7 +395,7 @@ class ModelManager:
                 cmd_list = [
                     sys.executable, "-m", "pip", "install", 
                     self.TURKISH_MODEL_URL
-                ]
+                ] + self.MODEL_WHEEL_PIP_FLAGS
                 model_name = "tr_core_news_lg"  # Override to ensure correct name
             else:
                 # Parse the command and build a secure command list
@@ -209,14 +404,9 @@ class ModelManager:
             print(f"  📦 Running: {' '.join(cmd_list[:4])}...")
             
             # Run installation using sys.executable to respect venv
-            result = subprocess.run(
-                cmd_list,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            returncode, output = self._run_streaming(cmd_list, idle_timeout=300)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 # Verify installation
                 if is_package(model_name):
                     # Add to config
@@ -240,11 +430,11 @@ class ModelManager:
                 else:
                     return {
                         "success": False,
-                        "error": f"Installation completed but model '{model_name}' not found. Check output: {result.stdout[-500:]}"
+                        "error": f"Installation completed but model '{model_name}' not found. Check output: {output[-500:]}"
                     }
             else:
-                # Show both stderr and stdout for better debugging
-                error_msg = result.stderr.strip() if result.stderr else result.stdout.strip()
+                # stderr is merged into the streamed output
+                error_msg = output.strip()
                 # Check for common error patterns
                 if "No compatible package found" in error_msg:
                     return {
@@ -257,10 +447,71 @@ class ModelManager:
                 }
                 
         except subprocess.TimeoutExpired:
-            return {"success": False, "error": "Installation timed out (5 minutes)"}
+            return {"success": False, "error": "Installation stalled (no output for 5 minutes)"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _run_streaming(cmd_list: List[str], idle_timeout: float) -> Tuple[int, str]:
+        """
+        Run a command, echoing its output as it arrives.
+        
+        The timeout is measured from the last line of output, so slow but
+        progressing downloads are not killed.
+        
+        Returns:
+            Tuple of (returncode, last lines of combined stdout/stderr)
+            
+        Raises:
+            subprocess.TimeoutExpired: No output for idle_timeout seconds
+        """
+        proc = subprocess.Popen(
+            cmd_list,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        tail = deque(maxlen=50)
+        
+        # Reader thread: a blocking readline can't be given a timeout portably (Windows)
+        def read_output():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+        
+        threading.Thread(target=read_output, daemon=True).start()
+        
+        try:
+            while True:
+                line = lines.get(timeout=idle_timeout)
+                if line is None:
+                    break
+                tail.append(line)
+                print(f"     {line.rstrip()}")
+        except queue.Empty:
+            proc.kill()
+            proc.wait()
+            raise subprocess.TimeoutExpired(cmd_list, idle_timeout)
+        
+        return proc.wait(), "".join(tail)
+    
+    # Dependencies are still resolved: some models need extra runtime packages
+    # (ja_* -> sudachipy, ru_*/uk_* -> pymorphy3, zh_* -> spacy-pkuseg,
+    # *_trf -> spacy-curated-transformers); only avoid building them from source
+    MODEL_WHEEL_PIP_FLAGS = ["--prefer-binary"]
+    
+    def _with_wheel_flags(self, args: List[str]) -> List[str]:
+        """Prefer prebuilt wheels for a model package and its dependencies."""
+        is_model_wheel = any(
+            arg.lower().endswith(".whl") or "huggingface.co" in arg or "spacy-models" in arg
+            for arg in args
+        )
+        if is_model_wheel:
+            return args + [f for f in self.MODEL_WHEEL_PIP_FLAGS if f not in args]
+        return args
+    
     def _build_safe_command(self, install_cmd: str) -> List[str]:
         """
         Build a safe command list from the install command string.
@@ -272,7 +523,7 @@ class ModelManager:
         # e.g., "pip install https://..." or "pip install spacy-model"
         if cmd_lower.startswith("pip install"):
             args = install_cmd.split()[2:]  # Everything after "pip install"
-            return [sys.executable, "-m", "pip", "install"] + args
+            return [sys.executable, "-m", "pip", "install"] + self._with_wheel_flags(args)
         
         # Case 2: python -m pip install <package>
         if "pip" in cmd_lower and "install" in cmd_lower:
@@ -281,7 +532,7 @@ class ModelManager:
             try:
                 install_idx = [p.lower() for p in parts].index("install")
                 args = parts[install_idx + 1:]
-                return [sys.executable, "-m", "pip", "install"] + args
+                return [sys.executable, "-m", "pip", "install"] + self._with_wheel_flags(args)
             except ValueError:
                 pass
         
@@ -316,11 +567,10 @@ class ModelManager:
         if not (has_spacy or has_pip or is_url):
             return {"valid": False, "error": "Command must contain 'spacy', 'pip', or be a URL"}
         
-        # Block dangerous shell operators
-        dangerous_patterns = ["&&", "||", ";", "|", "$", "`", "$(", "${", ">", "<", "\n", "\r"]
-        for pattern in dangerous_patterns:
-            if pattern in cmd:
-                return {"valid": False, "error": f"Invalid shell operator '{pattern}' in command"}
+        # Block dangerous shell operators (single scan)
+        match = _DANGEROUS_SHELL_RE.search(cmd)
+        if match:
+            return {"valid": False, "error": f"Invalid shell operator '{match.group(0)}' in command"}
         
         return {"valid": True}
     
@@ -346,8 +596,9 @@ class ModelManager:
         self._save_config()
         
         # Clear from cache
-        if model_name in self._loaded_models:
-            del self._loaded_models[model_name]
+        with self._models_lock:
+            self._loaded_models.pop(model_name, None)
+        clear_model_cache(model_name)
         
         # Actually uninstall the package
         if uninstall:
@@ -375,9 +626,15 @@ class ModelManager:
         
         return {"success": True, "message": f"Model '{model_name}' removed from configuration"}
     
+    def preload(self) -> None:
+        """Load installed models up front, up to the LRU cap (called at server startup)."""
+        for model in self.get_installed_models()[:self._max_models]:
+            self._load_model(model.get("model_name"))
+    
     def reload(self) -> None:
         """Reload configuration and clear model cache."""
-        self._loaded_models.clear()
+        with self._models_lock:
+            self._loaded_models.clear()
         self._load_config()
         print("  🔄 ModelManager reloaded")
 
@@ -5,16 +5,23 @@ SpaCy NLP kullanarak parçalanmış alt yazı cümlelerini birleştirir
 ve çeviri sonrası karakter oranına göre geri böler.
 """
 
+import os
+import re
+import heapq
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
 import spacy
+from spacy.pipeline import Sentencizer
 
-from parser import SubtitleBlock
+from parser import SubtitleBlock, parse_srt
+from backend.model_manager import load_sentence_model, create_sentencizer
 
 
-# SpaCy modelleri için cache (lazy loading)
-_nlp_models = {}
-
 # Dil kodlarından SpaCy model adlarına eşleme
 # DeepL dil kodları -> SpaCy model adları
 LANGUAGE_MODEL_MAP = {
@@ -29,35 +36,60 @@ LANGUAGE_MODEL_MAP = {
 # Çoklu dil modeli (fallback)
 MULTI_LANG_MODEL = "xx_sent_ud_sm"
 
+# Akış modunda nlp() çağrısı başına en az kaç blok işlenir
+MERGE_WINDOW_BLOCKS = 64
+
+# merge_sentences tek dosyayı bu boyutu aşan parçalara bölüp nlp.pipe ile işler
+MERGE_CHUNK_CHARS = 100_000
+
+# Sentencizer'ın cümle sonu kabul ettiği karakterler; hiçbiri yoksa metin tek cümledir
+_SENTENCE_PUNCT_RE = re.compile("[" + re.escape("".join(Sentencizer.default_punct_chars)) + "]")
+
+# nlp.pipe ayarları (çok dosyalı toplu işleme)
+SPACY_BATCH_SIZE = int(os.environ.get("SRT_SPACY_BATCH", 32))
+SPACY_N_PROCESS = int(os.environ.get("SRT_SPACY_NPROC", 1))
+
+# Sadece cümle sınırları kullanıldığı için varsayılan olarak rule-based
+# sentencizer kullanılır (istatistiksel parser'dan çok daha hızlı).
+# İstatistiksel modeller için SRT_SENTENCIZER_ONLY=0 verin.
+SENTENCIZER_ONLY = os.environ.get("SRT_SENTENCIZER_ONLY", "1") == "1"
+
+# Bir cümle en az bu kadar bloğa yayılıyorsa örtüşme hesabı NumPy ile yapılır
+# (daha az blokta Python döngüsü sabit maliyet yüzünden daha hızlı)
+VECTORIZE_MIN_BLOCKS = 16
 
-def get_nlp(source_lang: str = "EN"):
+
+@lru_cache(maxsize=None)
+def get_nlp(source_lang: str = "EN", model_name: Optional[str] = None):
     """
     Kaynak dile göre uygun SpaCy modelini lazy load eder.
     
+    SENTENCIZER_ONLY açıksa (varsayılan) ve model_name verilmemişse
+    doğrudan rule-based Sentencizer döner.
+    
     Öncelik sırası:
-    1. Dile özel model (en_core_web_sm, tr_core_web_md)
+    1. Dile özel model (model_name verilmişse o, yoksa en_core_web_sm, tr_core_web_md)
     2. Çoklu dil modeli (xx_sent_ud_sm)
     3. Rule-based Sentencizer (fallback)
     
     Args:
         source_lang: Kaynak dil kodu (DeepL formatında, örn: "EN", "TR", "DE")
+        model_name: Yüklenecek SpaCy model adı (opsiyonel)
         
     Returns:
-        SpaCy nlp nesnesi
+        SpaCy nlp nesnesi (cache'lenmiş)
     """
-    global _nlp_models
-    
-    # Önce cache'e bak
-    if source_lang in _nlp_models:
-        return _nlp_models[source_lang]
+    # Sonuç lru_cache ile (source_lang, model_name) başına saklanır
+    if SENTENCIZER_ONLY and model_name is None:
+        return create_sentencizer(source_lang)
     
     nlp = None
+    model_name = model_name or LANGUAGE_MODEL_MAP.get(source_lang)
     
     # 1. Dile özel model dene
-    if source_lang in LANGUAGE_MODEL_MAP:
-        model_name = LANGUAGE_MODEL_MAP[source_lang]
+    if model_name:
         try:
-            nlp = spacy.load(model_name)
+            nlp = load_sentence_model(model_name)
             print(f"  ✓ Loaded language-specific model: {model_name}")
         except OSError:
             print(f"  ⚠ Model not found: {model_name}, trying multi-language model...")
@@ -65,49 +97,43 @@ def get_nlp(source_lang: str = "EN"):
     # 2. Çoklu dil modeli dene
     if nlp is None:
         try:
-            nlp = spacy.load(MULTI_LANG_MODEL)
+            nlp = load_sentence_model(MULTI_LANG_MODEL)
             print(f"  ✓ Loaded multi-language model: {MULTI_LANG_MODEL}")
         except OSError:
             print(f"  ⚠ Multi-language model not found: {MULTI_LANG_MODEL}, using rule-based sentencizer...")
     
     # 3. Son çare: Rule-based Sentencizer
     if nlp is None:
-        nlp = create_sentencizer_nlp(source_lang)
-        print(f"  ✓ Using rule-based sentencizer for: {source_lang}")
+        nlp = create_sentencizer(source_lang)
     
-    # Cache'e kaydet
-    _nlp_models[source_lang] = nlp
     return nlp
 
 
+def preload(source_langs: Iterable[str] = ()) -> None:
+    """
+    Sunucu açılışında modelleri önceden yükler; ilk çeviri isteği
+    model yükleme süresini beklemez.
+    
+    Args:
+        source_langs: get_nlp ile ısıtılacak dil kodları
+    """
+    try:
+        from backend.model_manager import get_model_manager
+        get_model_manager().preload()
+    except ImportError:
+        pass
+    
+    for source_lang in source_langs:
+        get_nlp(source_lang)
+
+
 def create_sentencizer_nlp(lang_code: str):
     """
     Belirtilen dil için rule-based Sentencizer oluşturur.
     Noktalama işaretlerine göre cümle sonu tespit eder.
+    (ModelManager ile aynı kod yolu: backend.model_manager.create_sentencizer)
     """
-    # Desteklenen SpaCy dil sınıfları
-    lang_classes = {
-        "TR": "tr", "EN": "en", "EN-US": "en", "EN-GB": "en",
-        "DE": "de", "FR": "fr", "ES": "es", "IT": "it",
-        "PT-PT": "pt", "PT-BR": "pt", "NL": "nl", "PL": "pl",
-        "RU": "ru", "JA": "ja", "ZH": "zh", "KO": "ko",
-        "AR": "ar", "BG": "bg", "CS": "cs", "DA": "da",
-        "EL": "el", "ET": "et", "FI": "fi", "HU": "hu",
-        "ID": "id", "LT": "lt", "LV": "lv", "NB": "nb",
-        "RO": "ro", "SK": "sk", "SL": "sl", "SV": "sv",
-        "UK": "uk",
-    }
-    
-    spacy_lang = lang_classes.get(lang_code, "xx")  # xx = multi-language
-    
-    try:
-        nlp = spacy.blank(spacy_lang)
-    except:
-        nlp = spacy.blank("xx")  # Fallback to multi-language blank
-    
-    # Sentencizer ekle - noktalama kurallarıyla cümle bölme
-    nlp.add_pipe("sentencizer")
-    return nlp
+    return create_sentencizer(lang_code)
 
 
 @dataclass
@@ -121,92 +147,315 @@ class MergedSentence:
         return f"MergedSentence('{self.full_text[:50]}...' from {len(self.source_blocks)} blocks)"
 
 
-def merge_sentences_with_manager(blocks: List[SubtitleBlock], source_lang: str = "en") -> Tuple[List[MergedSentence], str, bool]:
+class BlockPositions(NamedTuple):
+    """Blokların birleşik metindeki [start, end) karakter aralıkları."""
+    starts: np.ndarray
+    ends: np.ndarray
+    blocks: List[SubtitleBlock]
+
+
+def _block_positions(blocks: List[SubtitleBlock]) -> Tuple[str, BlockPositions]:
     """
-    Merge sentences using ModelManager for dynamic model selection.
+    Blok metinlerini tek metinde birleştirir ve her bloğun
+    başlangıç/bitiş karakter pozisyonunu döndürür.
+    Pozisyonlar uzunlukların kümülatif toplamından tek geçişte hesaplanır.
+    """
+    # +1: bloklar arasındaki boşluk
+    lengths = np.fromiter((len(block.text) + 1 for block in blocks), np.int32, len(blocks))
+    ends = np.cumsum(lengths, dtype=np.int32)
+    starts = ends - lengths
     
-    Args:
-        blocks: SubtitleBlock list
-        source_lang: ISO language code (e.g., 'en', 'tr', 'de')
+    return " ".join(block.text for block in blocks), BlockPositions(starts, ends - 1, blocks)
+
+
+def _python_overlaps(bs: np.ndarray, be: np.ndarray, ss: np.ndarray, se: np.ndarray):
+    """
+    Cümle/blok örtüşmeleri (backend._overlap_kernel.overlaps ile aynı çıktı).
+    numba yoksa kullanılır.
+    
+    Returns:
+        (ptr, idx, contrib): cümle s için örtüşen bloklar idx[ptr[s]:ptr[s+1]]
+    """
+    # Bloklar ve cümleler karakter pozisyonuna göre sıralı: iki işaretçili tarama (O(S+B))
+    block_starts = bs.tolist()
+    block_ends = be.tolist()
+    ptr = [0]
+    idx = []
+    contrib = []
+    bi = 0
+    
+    for sent_start, sent_end in zip(ss.tolist(), se.tolist()):
+        # Cümleden tamamen önce biten bloklar sonraki cümlelerle de örtüşmez
+        bi = bisect_right(block_ends, sent_start, bi)
+        
+        # Cümle bitmeden başlayan son bloğun sınırı
+        hi = bisect_left(block_starts, sent_end, bi)
         
+        if hi - bi >= VECTORIZE_MIN_BLOCKS:
+            overlaps = np.minimum(be[bi:hi], sent_end) - np.maximum(bs[bi:hi], sent_start)
+            hits = np.flatnonzero(overlaps > 0)
+            idx.extend((hits + bi).tolist())
+            contrib.extend(overlaps[hits].tolist())
+        else:
+            for j in range(bi, hi):
+                # Örtüşme kontrolü
+                overlap_start = max(sent_start, block_starts[j])
+                overlap_end = min(sent_end, block_ends[j])
+                
+                if overlap_start < overlap_end:
+                    idx.append(j)
+                    # Bu bloğun cümleye katkı yaptığı karakter sayısı
+                    contrib.append(overlap_end - overlap_start)
+        ptr.append(len(idx))
+    
+    return ptr, idx, contrib
+
+
+def _python_split_points(spaces: np.ndarray, ratios: np.ndarray, total_len: int) -> List[int]:
+    """smart_split kesim pozisyonları (backend._overlap_kernel.split_points ile aynı)."""
+    cuts = []
+    current_pos = 0
+    
+    for ratio in ratios.tolist():
+        # Hedef pozisyonu hesapla
+        target_pos = current_pos + int(total_len * ratio)
+        # target_pos'a en yakın boşluğu bul
+        current_pos = _best_split_from_spaces(spaces, current_pos, target_pos, total_len)
+        cuts.append(current_pos)
+    
+    return cuts
+
+
+try:
+    from backend._overlap_kernel import overlaps as _overlaps, split_points as _split_points
+except ImportError:
+    _overlaps = _python_overlaps
+    _split_points = _python_split_points
+
+
+def _merge_doc(doc, block_positions: BlockPositions) -> List[Tuple[MergedSentence, int]]:
+    """
+    SpaCy cümlelerini kaynak bloklarla eşleştirir.
+    
     Returns:
-        Tuple of (merged_sentences, model_name, is_fallback)
+        (MergedSentence, cümle bitiş pozisyonu) listesi
     """
-    if not blocks:
-        return [], "none", False
+    # Sadece karakter aralıkları alınır; cümle metni örtüşme bulunursa kesilir
+    spans = [(sent.start_char, sent.end_char) for sent in doc.sents]
+    return _merge_spans(doc.text, spans, block_positions)
+
+
+def _merge_spans(full_text: str, spans: List[Tuple[int, int]],
+                 block_positions: BlockPositions) -> List[Tuple[MergedSentence, int]]:
+    """Cümle karakter aralıklarını (start, end) kaynak bloklarla eşleştirir."""
+    merged_sentences = []
+    starts_arr, ends_arr, blocks = block_positions
+    
+    sent_starts = np.fromiter((start for start, _ in spans), np.int32, len(spans))
+    sent_ends = np.fromiter((end for _, end in spans), np.int32, len(spans))
+    
+    # Tüm dokümanın örtüşmeleri tek çağrıda (numba varsa native)
+    ptr, idx, contrib = _overlaps(starts_arr, ends_arr, sent_starts, sent_ends)
+    ptr = np.asarray(ptr, dtype=np.int64)
+    contrib = np.asarray(contrib, dtype=np.int64)
+    
+    # Karakter oranları tüm doküman için tek seferde: katkı / cümle toplamı
+    # (örtüşmeler daima > 0 olduğu için toplam sıfır olamaz)
+    cumulative = np.concatenate(([0], np.cumsum(contrib)))
+    totals = cumulative[ptr[1:]] - cumulative[ptr[:-1]]
+    ratios = (contrib / np.repeat(totals, np.diff(ptr))).tolist()
+    ptr = ptr.tolist()
+    idx = idx.tolist() if isinstance(idx, np.ndarray) else idx
+    
+    for s, (sent_start, sent_end) in enumerate(spans):
+        lo, hi = ptr[s], ptr[s + 1]
+        if lo == hi:
+            continue
+        
+        sent_text = full_text[sent_start:sent_end].strip()
+        if not sent_text:
+            continue
+        
+        merged = MergedSentence(
+            full_text=sent_text,
+            source_blocks=[blocks[j] for j in idx[lo:hi]],
+            char_ratios=ratios[lo:hi]
+        )
+        merged_sentences.append((merged, sent_end))
     
-    # Use ModelManager for model selection
+    return merged_sentences
+
+
+def iter_merged_sentences(blocks: Iterable[SubtitleBlock], nlp,
+                          window: int = MERGE_WINDOW_BLOCKS) -> Iterator[MergedSentence]:
+    """
+    Blokları kayan pencereyle işler ve kapanan cümleleri hemen üretir.
+    
+    Pencere dolunca SpaCy çalıştırılır; bir blok sınırında biten son cümleye
+    kadar olan cümleler yayınlanır, kalan bloklar sonraki pencereye taşınır.
+    Böylece bellekte sadece birkaç cümlelik pencere tutulur ve çeviri
+    aşaması parse bitmeden başlayabilir.
+    
+    Args:
+        blocks: SubtitleBlock akışı (liste veya generator)
+        nlp: SpaCy nlp nesnesi
+        window: nlp() çağrısı başına minimum blok sayısı
+        
+    Yields:
+        MergedSentence: Tamamlanmış cümleler (dosya sırasıyla)
+    """
+    buffer: List[SubtitleBlock] = []
+    flush_at = window
+    
+    for block in blocks:
+        buffer.append(block)
+        if len(buffer) < flush_at:
+            continue
+        
+        full_text, block_positions = _block_positions(buffer)
+        sentences = _merge_doc(nlp(full_text), block_positions)
+        block_ends = {end: i + 1 for i, end in enumerate(block_positions.ends.tolist())}
+        
+        # Son cümle bir sonraki bloğa devam ediyor olabilir, onu hiç yayınlama
+        consumed = 0
+        emit = 0
+        for n, (_, sent_end) in enumerate(sentences[:-1], start=1):
+            if sent_end in block_ends:
+                consumed = block_ends[sent_end]
+                emit = n
+        
+        for merged, _ in sentences[:emit]:
+            yield merged
+        
+        buffer = buffer[consumed:]
+        # Sınır bulunamadıysa pencereyi büyüt (her blokta yeniden işlemeyi önler)
+        flush_at = len(buffer) + window
+    
+    if buffer:
+        full_text, block_positions = _block_positions(buffer)
+        for merged, _ in _merge_doc(nlp(full_text), block_positions):
+            yield merged
+
+
+def get_nlp_with_manager(source_lang: str = "en") -> Tuple[object, str, bool]:
+    """
+    Select a SpaCy pipeline through ModelManager.
+    
+    Returns:
+        Tuple of (nlp, model_name, is_fallback)
+    """
     try:
         from backend.model_manager import get_model_manager
         manager = get_model_manager()
-        nlp, model_name, is_fallback = manager.get_model_for_language(source_lang)
+        return manager.get_model_for_language(source_lang)
     except ImportError:
         # Fallback to old behavior if backend not available
-        nlp = get_nlp(source_lang)
-        model_name = "legacy"
-        is_fallback = True
+        return get_nlp(source_lang), "legacy", True
+
+
+def merge_sentences_with_manager(blocks: Iterable[SubtitleBlock], source_lang: str = "en") -> Tuple[List[MergedSentence], str, bool]:
+    """
+    Merge sentences using ModelManager for dynamic model selection.
     
-    # Rest of the merge logic
-    block_positions: List[Tuple[int, int, SubtitleBlock]] = []
-    full_text_parts = []
-    current_pos = 0
+    The language is never detected here; callers pass the per-file
+    detection result so every segment uses the same model.
     
-    for block in blocks:
-        text = block.text
-        start_pos = current_pos
-        end_pos = current_pos + len(text)
-        block_positions.append((start_pos, end_pos, block))
-        full_text_parts.append(text)
-        current_pos = end_pos + 1
+    Args:
+        blocks: SubtitleBlock list or stream (e.g. parser.iter_srt)
+        source_lang: ISO language code (e.g., 'en', 'tr', 'de')
+        
+    Returns:
+        Tuple of (merged_sentences, model_name, is_fallback)
+    """
+    blocks = iter(blocks)
+    first = next(blocks, None)
+    if first is None:
+        return [], "none", False
     
-    full_text = " ".join(full_text_parts)
-    doc = nlp(full_text)
+    nlp, model_name, is_fallback = get_nlp_with_manager(source_lang)
+    merged_sentences = list(iter_merged_sentences(chain([first], blocks), nlp))
     
-    merged_sentences = []
+    return merged_sentences, model_name, is_fallback
+
+
+def merge_sentences_many(docs_blocks: List[List[SubtitleBlock]], source_lang: str = "EN",
+                         nlp=None) -> List[List[MergedSentence]]:
+    """
+    Birden fazla SRT dosyasının bloklarını tek nlp.pipe çağrısıyla birleştirir.
     
-    for sent in doc.sents:
-        sent_start = sent.start_char
-        sent_end = sent.end_char
-        sent_text = sent.text.strip()
-        
-        if not sent_text:
-            continue
-        
-        overlapping_blocks = []
-        char_contributions = []
+    nlp.pipe dokümanları toplu işler (SRT_SPACY_BATCH) ve istenirse
+    birden fazla süreçte çalışır (SRT_SPACY_NPROC).
+    
+    Args:
+        docs_blocks: Her dosya için SubtitleBlock listesi
+        source_lang: Kaynak dil kodu (DeepL formatında, örn: "EN", "TR", "DE")
+        nlp: Kullanılacak SpaCy nesnesi (verilmezse get_nlp)
         
-        for block_start, block_end, block in block_positions:
-            overlap_start = max(sent_start, block_start)
-            overlap_end = min(sent_end, block_end)
-            
-            if overlap_start < overlap_end:
-                overlapping_blocks.append(block)
-                contribution = overlap_end - overlap_start
-                char_contributions.append(contribution)
+    Returns:
+        List[List[MergedSentence]]: Dosya sırasıyla birleştirilmiş cümleler
+    """
+    if not docs_blocks:
+        return []
+    
+    nlp = nlp or get_nlp(source_lang)
+    # Pozisyonlar context olarak dokümanla birlikte taşınır (as_tuples)
+    docs = nlp.pipe(
+        (_block_positions(blocks) for blocks in docs_blocks),
+        as_tuples=True,
+        batch_size=SPACY_BATCH_SIZE,
+        n_process=SPACY_N_PROCESS
+    )
+    
+    return [
+        [merged for merged, _ in _merge_doc(doc, block_positions)]
+        for doc, block_positions in docs
+    ]
+
+
+# Worker süreci başına bir kez yüklenen SpaCy nesnesi (process_files)
+_worker_nlp = None
+
+
+def _init_worker_nlp(source_lang: str) -> None:
+    """ProcessPoolExecutor initializer: modeli her süreçte bir kez yükler."""
+    global _worker_nlp
+    _worker_nlp = get_nlp(source_lang)
+
+
+def _merge_file(path: str) -> List[MergedSentence]:
+    """Worker: tek SRT dosyasını parse edip cümleleri birleştirir."""
+    return merge_sentences_many([parse_srt(path)], nlp=_worker_nlp)[0]
+
+
+def process_files(paths: List[str], source_lang: str = "EN",
+                  max_workers: Optional[int] = None) -> List[List[MergedSentence]]:
+    """
+    Birden fazla SRT dosyasını süreç havuzunda paralel parse eder ve birleştirir.
+    Her worker SpaCy modelini bir kez yükler ve kendi dosyalarında kullanır.
+    
+    Args:
+        paths: SRT dosya yolları
+        source_lang: Kaynak dil kodu (DeepL formatında, örn: "EN", "TR", "DE")
+        max_workers: Süreç sayısı (varsayılan: CPU sayısı, dosya sayısıyla sınırlı)
         
-        if overlapping_blocks:
-            total_chars = sum(char_contributions)
-            if total_chars > 0:
-                char_ratios = [c / total_chars for c in char_contributions]
-            else:
-                char_ratios = [1.0 / len(overlapping_blocks)] * len(overlapping_blocks)
-            
-            merged = MergedSentence(
-                full_text=sent_text,
-                source_blocks=overlapping_blocks,
-                char_ratios=char_ratios
-            )
-            merged_sentences.append(merged)
+    Returns:
+        List[List[MergedSentence]]: Dosya sırasıyla birleştirilmiş cümleler
+    """
+    if not paths:
+        return []
     
-    return merged_sentences, model_name, is_fallback
+    max_workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker_nlp,
+                             initargs=(source_lang,)) as executor:
+        return list(executor.map(_merge_file, paths))
 
 
-def merge_sentences(blocks: List[SubtitleBlock], source_lang: str = "EN") -> List[MergedSentence]:
+def merge_sentences(blocks: List[SubtitleBlock], source_lang: str = "EN", nlp=None) -> List[MergedSentence]:
     """
     Alt yazı bloklarını SpaCy ile gerçek cümle sınırlarına göre birleştirir.
     
     Algoritma:
-    1. Tüm blok metinlerini birleştir
+    1. Blok metinlerini birleştir
     2. SpaCy ile cümle sınırlarını tespit et
     3. Her cümlenin hangi bloklardan geldiğini izle
     4. Karakter oranlarını hesapla
@@ -214,6 +463,7 @@ def merge_sentences(blocks: List[SubtitleBlock], source_lang: str = "EN") -> Lis
     Args:
         blocks: SubtitleBlock listesi
         source_lang: Kaynak dil kodu (DeepL formatında, örn: "EN", "TR", "DE")
+        nlp: Önceden yüklenmiş SpaCy pipeline (verilmezse get_nlp(source_lang))
         
     Returns:
         List[MergedSentence]: Birleştirilmiş cümleler
@@ -221,70 +471,49 @@ def merge_sentences(blocks: List[SubtitleBlock], source_lang: str = "EN") -> Lis
     if not blocks:
         return []
     
-    nlp = get_nlp(source_lang)
+    # Cümle sonu noktalaması yoksa rule-based sentencizer'ın bölecek bir şeyi yok:
+    # SpaCy hiç yüklenmez. İstatistiksel modeller noktalamasız metni de bölebilir,
+    # bu yüzden dışarıdan nlp verildiyse kısayol uygulanmaz.
+    # (tek blok da birden fazla cümle içerebilir, o yüzden SpaCy'ye gider)
+    if nlp is None and SENTENCIZER_ONLY and not any(_SENTENCE_PUNCT_RE.search(block.text) for block in blocks):
+        full_text, block_positions = _block_positions(blocks)
+        return [merged for merged, _ in _merge_spans(full_text, [(0, len(full_text))], block_positions)]
     
-    # Block sınırlarını ve pozisyonlarını izle
-    # Her bloğun başlangıç ve bitiş karakter pozisyonunu tut
-    block_positions: List[Tuple[int, int, SubtitleBlock]] = []
-    full_text_parts = []
-    current_pos = 0
+    if nlp is None:
+        nlp = get_nlp(source_lang)
+    chunks = _chunk_blocks(blocks, nlp)
+    return [merged for part in merge_sentences_many(chunks, nlp=nlp) for merged in part]
+
+
+def _is_sentence_break(nlp, prev: SubtitleBlock, block: SubtitleBlock) -> bool:
+    """İki blok arasında cümle sınırı var mı (sadece bu iki blok işlenir)."""
+    boundary = len(prev.text) + 1
+    doc = nlp(prev.text + " " + block.text)
+    return any(sent.start_char == boundary for sent in doc.sents)
+
+
+def _chunk_blocks(blocks: List[SubtitleBlock], nlp,
+                  max_chars: int = MERGE_CHUNK_CHARS) -> List[List[SubtitleBlock]]:
+    """
+    Blokları yaklaşık max_chars boyutunda parçalara böler.
+    Parça sadece cümle sınırına denk gelen blok geçişlerinde kesilir,
+    böylece hiçbir cümle iki parçaya bölünmez.
+    """
+    chunks = []
+    current: List[SubtitleBlock] = []
+    size = 0
     
     for block in blocks:
-        text = block.text
-        start_pos = current_pos
-        end_pos = current_pos + len(text)
-        block_positions.append((start_pos, end_pos, block))
-        full_text_parts.append(text)
-        current_pos = end_pos + 1  # +1 for space
-    
-    # Tüm metni birleştir
-    full_text = " ".join(full_text_parts)
-    
-    # SpaCy ile işle
-    doc = nlp(full_text)
-    
-    # Cümleleri ve kaynak bloklarını eşleştir
-    merged_sentences = []
-    
-    for sent in doc.sents:
-        sent_start = sent.start_char
-        sent_end = sent.end_char
-        sent_text = sent.text.strip()
-        
-        if not sent_text:
-            continue
-        
-        # Bu cümleyle örtüşen blokları bul
-        overlapping_blocks = []
-        char_contributions = []
-        
-        for block_start, block_end, block in block_positions:
-            # Örtüşme kontrolü
-            overlap_start = max(sent_start, block_start)
-            overlap_end = min(sent_end, block_end)
-            
-            if overlap_start < overlap_end:
-                overlapping_blocks.append(block)
-                # Bu bloğun cümleye katkı yaptığı karakter sayısı
-                contribution = overlap_end - overlap_start
-                char_contributions.append(contribution)
-        
-        if overlapping_blocks:
-            # Karakter oranlarını hesapla
-            total_chars = sum(char_contributions)
-            if total_chars > 0:
-                char_ratios = [c / total_chars for c in char_contributions]
-            else:
-                char_ratios = [1.0 / len(overlapping_blocks)] * len(overlapping_blocks)
-            
-            merged = MergedSentence(
-                full_text=sent_text,
-                source_blocks=overlapping_blocks,
-                char_ratios=char_ratios
-            )
-            merged_sentences.append(merged)
-    
-    return merged_sentences
+        if size >= max_chars and _is_sentence_break(nlp, current[-1], block):
+            chunks.append(current)
+            current = []
+            size = 0
+        current.append(block)
+        size += len(block.text) + 1
+    
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 def smart_split(translated_text: str, ratios: List[float]) -> List[str]:
@@ -307,14 +536,14 @@ def smart_split(translated_text: str, ratios: List[float]) -> List[str]:
     parts = []
     current_pos = 0
     
-    for i, ratio in enumerate(ratios[:-1]):  # Son parça için bölme yapma
-        # Hedef pozisyonu hesapla
-        target_len = int(total_len * ratio)
-        target_pos = current_pos + target_len
-        
-        # target_pos'a en yakın boşluğu bul
-        best_split = find_best_split_position(text, current_pos, target_pos, total_len)
-        
+    # Boşluk pozisyonları tek seferde çıkarılır; her bölme O(log n) arama yapar
+    # (utf-32: her karakter 4 byte, indeksler karakter pozisyonuyla aynı)
+    spaces = np.flatnonzero(np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32) == 0x20)
+    
+    # Son parça için bölme yapma
+    cuts = _split_points(spaces, np.asarray(ratios[:-1], dtype=np.float64), total_len)
+    
+    for best_split in (cuts.tolist() if isinstance(cuts, np.ndarray) else cuts):
         # Parçayı al
         part = text[current_pos:best_split].strip()
         if part:  # Boş parça ekleme
@@ -326,65 +555,94 @@ def smart_split(translated_text: str, ratios: List[float]) -> List[str]:
     if last_part:
         parts.append(last_part)
     
-    # Parça sayısı ratio sayısından azsa, son parçaları birleştir veya ayır
-    while len(parts) < len(ratios):
-        # Yeterli parça yoksa, en uzun parçayı böl
-        if parts:
-            longest_idx = max(range(len(parts)), key=lambda i: len(parts[i]))
-            longest = parts[longest_idx]
-            mid = len(longest) // 2
-            # En yakın boşluğu bul
-            split_pos = find_nearest_space(longest, mid)
-            if split_pos > 0 and split_pos < len(longest):
-                part1 = longest[:split_pos].strip()
-                part2 = longest[split_pos:].strip()
-                parts[longest_idx:longest_idx+1] = [part1, part2]
-            else:
-                parts.append("")  # Boş parça ekle
-        else:
-            parts.append("")
+    # Parça sayısı ratio sayısından azsa, en uzun parçaları böl
+    deficit = len(ratios) - len(parts)
+    if deficit > 0:
+        parts = _split_longest(parts, deficit)
     
     return parts[:len(ratios)]  # Fazla parça varsa kes
 
 
+def _split_longest(parts: List[str], count: int) -> List[str]:
+    """
+    En uzun parçayı `count` kez ortasına en yakın boşluktan ikiye böler.
+    Bölünemeyen bir parçaya gelindiğinde eksik kalanlar boş parça olarak eklenir.
+    
+    Heap ile her adım O(log k). Eşit uzunlukta soldaki parça önce bölünür;
+    sıra anahtarı (tuple) bölünen parçanın yarılarını yerinde tutar.
+    """
+    heap = [(-len(part), (i,), part) for i, part in enumerate(parts)]
+    heapq.heapify(heap)
+    
+    while count and heap:
+        _, key, longest = heap[0]
+        # En yakın boşluğu bul
+        split_pos = find_nearest_space(longest, len(longest) // 2)
+        if not 0 < split_pos < len(longest):
+            break
+        part1 = longest[:split_pos].strip()
+        part2 = longest[split_pos:].strip()
+        heapq.heapreplace(heap, (-len(part1), key + (0,), part1))
+        heapq.heappush(heap, (-len(part2), key + (1,), part2))
+        count -= 1
+    
+    heap.sort(key=lambda entry: entry[1])
+    return [part for _, _, part in heap] + [""] * count
+
+
 def find_best_split_position(text: str, start: int, target: int, end: int) -> int:
     """
     Hedef pozisyona en yakın boşluk karakterini bulur.
+    Eşit uzaklıkta sol taraf tercih edilir.
     """
     # Arama aralığı: target'ın %20'si kadar sağa ve sola bak
     search_range = max(10, int((end - start) * 0.2))
     
-    best_pos = target
-    min_distance = float('inf')
+    # str.rfind / str.find C'de tarar (karakter karakter Python döngüsü yok)
+    left = text.rfind(' ', max(start + 1, target - search_range), min(target + 1, end))
+    right = text.find(' ', target + 1, min(end, target + search_range + 1))
+    
+    if left == -1:
+        return target if right == -1 else right
+    if right == -1 or target - left <= right - target:
+        return left
+    return right
+
+
+def _best_split_from_spaces(spaces: np.ndarray, start: int, target: int, end: int) -> int:
+    """
+    find_best_split_position ile aynı sonuç; metin yerine önceden
+    hesaplanmış sıralı boşluk pozisyonları üzerinde ikili arama yapar.
+    """
+    search_range = max(10, int((end - start) * 0.2))
+    
+    i = int(np.searchsorted(spaces, target, side='right'))
+    left = int(spaces[i - 1]) if i > 0 else -1
+    right = int(spaces[i]) if i < len(spaces) else -1
     
-    # Hedefin etrafında boşluk ara
-    for offset in range(-search_range, search_range + 1):
-        pos = target + offset
-        if start < pos < end and text[pos] == ' ':
-            distance = abs(offset)
-            if distance < min_distance:
-                min_distance = distance
-                best_pos = pos
+    if left <= start or left < target - search_range or left >= end:
+        left = -1
+    if right >= min(end, target + search_range + 1):
+        right = -1
     
-    return best_pos
+    if left == -1:
+        return target if right == -1 else right
+    if right == -1 or target - left <= right - target:
+        return left
+    return right
 
 
 def find_nearest_space(text: str, pos: int) -> int:
     """Verilen pozisyona en yakın boşluğu bulur."""
-    left = pos
-    right = pos
-    
-    while left > 0 or right < len(text):
-        if left > 0:
-            left -= 1
-            if text[left] == ' ':
-                return left
-        if right < len(text):
-            if text[right] == ' ':
-                return right
-            right += 1
-    
-    return pos
+    left = text.rfind(' ', 0, pos)
+    right = text.find(' ', pos)
+    
+    if left == -1:
+        return pos if right == -1 else right
+    # Sol taraf bir karakter avantajlı (önceki tarama sırasıyla aynı sonuç)
+    if right == -1 or pos - left <= right - pos + 1:
+        return left
+    return right
 
 
 if __name__ == "__main__":
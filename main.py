@@ -5,13 +5,20 @@ Tüm modülleri bir araya getirerek SRT çevirisini orchestrate eder.
 """
 
 import argparse
+import os
 import sys
+import secrets
+from collections import defaultdict
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
 from pathlib import Path
 from typing import List, Optional
 
+import orjson
+
 from parser import parse_srt, save_srt, SubtitleBlock
-from engine import merge_sentences, smart_split, MergedSentence
-from translator import DeepLTranslator, MockTranslator, TranslationConfig
+from engine import merge_sentences, smart_split, MergedSentence, get_nlp
+from translator import DeepLTranslator, MockTranslator, TranslationConfig, AIOHTTP_AVAILABLE
 
 
 def process_srt(input_path: str, 
@@ -19,7 +26,9 @@ def process_srt(input_path: str,
                 target_lang: str = "TR",
                 use_mock: bool = False,
                 api_key: Optional[str] = None,
-                verbose: bool = False) -> None:
+                verbose: bool = False,
+                source_lang: str = "EN",
+                nlp=None) -> None:
     """
     SRT dosyasını işler: parse -> merge -> translate -> split -> save
     
@@ -30,6 +39,8 @@ def process_srt(input_path: str,
         use_mock: Mock translator kullan (test için)
         api_key: DeepL API key
         verbose: Detaylı çıktı
+        source_lang: Kaynak dil kodu (cümle bölme modeli için)
+        nlp: Önceden yüklenmiş SpaCy pipeline (--serve worker'ı verir)
     """
     
     # 1. Parse SRT
@@ -44,7 +55,7 @@ def process_srt(input_path: str,
     if verbose:
         print("[2/5] Merging sentences with SpaCy NLP...")
     
-    merged = merge_sentences(blocks)
+    merged = merge_sentences(blocks, source_lang, nlp=nlp)
     if verbose:
         print(f"      Detected {len(merged)} complete sentences")
         for i, m in enumerate(merged[:3]):
@@ -61,36 +72,40 @@ def process_srt(input_path: str,
     
     config = TranslationConfig(target_lang=target_lang)
     
-    # Tüm cümleleri toplu çevir
+    # Tüm cümleleri toplu çevir (tekrarlanan cümleler yalnızca bir kez gönderilir)
     sentences_to_translate = [m.full_text for m in merged]
-    translated_sentences = translator.translate_batch(sentences_to_translate, config)
+    unique_sentences = list(dict.fromkeys(sentences_to_translate))
+    if AIOHTTP_AVAILABLE:
+        # DeepL sınırlarına uyan parçalar eşzamanlı gönderilir
+        translated_unique = translator.translate_batch_parallel(unique_sentences, config)
+    else:
+        translated_unique = translator.translate_batch(unique_sentences, config)
+    lookup = dict(zip(unique_sentences, translated_unique))
+    translated_sentences = [lookup[s] for s in sentences_to_translate]
     
     if verbose:
-        print(f"      Translated {len(translated_sentences)} sentences")
+        print(f"      Translated {len(unique_sentences)} unique of {len(translated_sentences)} sentences")
     
     # 4. Smart split and rebuild
     if verbose:
         print("[4/5] Smart splitting translated text...")
     
-    # Block index -> translated text mapping
-    block_translations = {}
+    # Block index -> translated parts (joined once at the end)
+    block_parts = defaultdict(list)
     
     for merged_sent, translated_text in zip(merged, translated_sentences):
         # Çevrilmiş cümleyi orijinal blok oranlarına göre böl
         split_parts = smart_split(translated_text, merged_sent.char_ratios)
         
-        # Her parçayı ilgili bloğa eşle
+        # Her parçayı ilgili bloğa eşle (aynı blok birden fazla cümlede olabilir)
         for block, part in zip(merged_sent.source_blocks, split_parts):
-            # Aynı blok birden fazla cümlede olabilir, birleştir
-            if block.index in block_translations:
-                block_translations[block.index] += " " + part
-            else:
-                block_translations[block.index] = part
+            block_parts[block.index].append(part)
     
     # Sıralı çeviri listesi oluştur
-    translated_texts = []
-    for block in blocks:
-        translated_texts.append(block_translations.get(block.index, block.text))
+    translated_texts = [
+        " ".join(block_parts[block.index]) if block.index in block_parts else block.text
+        for block in blocks
+    ]
     
     if verbose:
         print(f"      Mapped translations to {len(translated_texts)} blocks")
@@ -108,6 +123,60 @@ def process_srt(input_path: str,
     print(f"  Sentences: {len(merged)}")
 
 
+# Kalıcı worker (--serve / --connect) ayarları
+SERVE_PORT = 5051
+SERVE_KEY_FILE = Path.home() / ".cache" / "srt-smart-translator" / "serve.key"
+
+
+def _serve_key() -> bytes:
+    """Worker kimlik doğrulama anahtarı (ilk kullanımda rastgele oluşturulur, 0600)."""
+    if not SERVE_KEY_FILE.exists():
+        SERVE_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(SERVE_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+    return SERVE_KEY_FILE.read_text().strip().encode()
+
+
+def serve(port: int = SERVE_PORT, source_lang: str = "EN", model_name: Optional[str] = None) -> None:
+    """
+    SpaCy'yi bir kez yükleyip localhost üzerinden gelen işleri sırayla çalıştırır.
+    Her iş process_srt argümanlarını içeren bir JSON mesajıdır.
+    
+    model_name verilmezse rule-based sentencizer kullanılır (SENTENCIZER_ONLY);
+    worker asıl faydasını istatistiksel bir model sıcak tutulduğunda sağlar.
+    """
+    # Modeli ilk işten önce ısıt; aynı kaynak dildeki işler bu pipeline'ı kullanır
+    nlp = get_nlp(source_lang, model_name)
+    
+    with Listener(('127.0.0.1', port), authkey=_serve_key()) as listener:
+        print(f"✓ Worker ready on 127.0.0.1:{port} [{source_lang}, {model_name or 'sentencizer'}] (Ctrl+C to stop)")
+        while True:
+            try:
+                conn = listener.accept()
+            except KeyboardInterrupt:
+                break
+            except Exception as e:  # Kimlik doğrulama hatası vb.
+                print(f"Rejected connection: {e}")
+                continue
+            
+            with conn:
+                try:
+                    job = orjson.loads(conn.recv_bytes())
+                    job_lang = job.setdefault("source_lang", source_lang)
+                    process_srt(**job, nlp=nlp if job_lang == source_lang else None)
+                    conn.send_bytes(orjson.dumps({"ok": True}))
+                except Exception as e:
+                    conn.send_bytes(orjson.dumps({"ok": False, "error": str(e)}))
+
+
+def connect(job: dict, port: int = SERVE_PORT) -> dict:
+    """Çalışan worker'a tek bir iş gönderir ve sonucunu döndürür."""
+    with Client(('127.0.0.1', port), authkey=_serve_key()) as conn:
+        conn.send_bytes(orjson.dumps(job))
+        return orjson.loads(conn.recv_bytes())
+
+
 def demo_mode(verbose: bool = True) -> None:
     """
     Demo modu - örnek veri ile SpaCy cümle birleştirmeyi gösterir.
@@ -177,16 +246,23 @@ Examples:
   python main.py input.srt output.srt --lang TR
   python main.py input.srt output.srt --mock --verbose
   python main.py --demo
+  python main.py --serve --model en_core_web_sm   # keep a SpaCy model loaded between files
+  python main.py input.srt output.srt --connect
         """
     )
     
     parser.add_argument("input", nargs="?", help="Input SRT file path")
     parser.add_argument("output", nargs="?", help="Output SRT file path")
     parser.add_argument("--lang", "-l", default="TR", help="Target language code (default: TR)")
+    parser.add_argument("--source-lang", "-s", default="EN", help="Source language code for sentence splitting (default: EN)")
+    parser.add_argument("--model", help="SpaCy model for sentence splitting (default: rule-based sentencizer)")
     parser.add_argument("--mock", "-m", action="store_true", help="Use mock translator (for testing)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--demo", "-d", action="store_true", help="Run demo mode")
     parser.add_argument("--api-key", "-k", help="DeepL API key (or set DEEPL_API_KEY env var)")
+    parser.add_argument("--serve", action="store_true", help="Run a persistent worker that keeps SpaCy loaded")
+    parser.add_argument("--connect", action="store_true", help="Send this job to a running --serve worker")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help=f"Worker port (default: {SERVE_PORT})")
     
     args = parser.parse_args()
     
@@ -194,6 +270,10 @@ Examples:
         demo_mode(verbose=True)
         return
     
+    if args.serve:
+        serve(port=args.port, source_lang=args.source_lang, model_name=args.model)
+        return
+    
     if not args.input or not args.output:
         parser.print_help()
         print("\nError: Both input and output files are required (unless using --demo)")
@@ -204,6 +284,31 @@ Examples:
         print(f"Error: Input file not found: {args.input}")
         sys.exit(1)
     
+    if args.connect:
+        job = {
+            "input_path": str(Path(args.input).resolve()),
+            "output_path": str(Path(args.output).resolve()),
+            "target_lang": args.lang,
+            "source_lang": args.source_lang,
+            "use_mock": args.mock,
+            "api_key": args.api_key,
+            "verbose": args.verbose,
+        }
+        try:
+            result = connect(job, port=args.port)
+        except ConnectionRefusedError:
+            print(f"Error: No worker running on port {args.port} (start one with --serve)")
+            sys.exit(1)
+        except AuthenticationError:
+            print(f"Error: Worker on port {args.port} rejected the key in {SERVE_KEY_FILE} "
+                  f"(is it running as another user?)")
+            sys.exit(1)
+        if not result["ok"]:
+            print(f"Error: {result['error']}")
+            sys.exit(1)
+        print(f"✓ Translation complete: {args.output}")
+        return
+    
     try:
         process_srt(
             input_path=args.input,
@@ -211,7 +316,9 @@ Examples:
             target_lang=args.lang,
             use_mock=args.mock,
             api_key=args.api_key,
-            verbose=args.verbose
+            verbose=args.verbose,
+            source_lang=args.source_lang,
+            nlp=get_nlp(args.source_lang, args.model) if args.model else None
         )
     except Exception as e:
         print(f"Error: {e}")
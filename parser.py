@@ -1,20 +1,28 @@
 """
 parser.py - SRT Parsing Module
 
-pysrt kullanarak SRT dosyasını okur ve her bloğu
+SRT dosyasını okur ve her bloğu
 timestamp bilgisiyle birlikte yapılandırılmış veri olarak döndürür.
 Orijinal satır yapısı (line_count) korunur.
 """
 
+import re
 from dataclasses import dataclass, field
-from typing import List
-import pysrt
+from typing import Iterable, Iterator, List, Optional
 from pysrt import SubRipTime
 
+# Zaman damgası ayırıcıları (pysrt ile aynı: ':', '.', ',')
+_TIME_SEP = re.compile(r'[:.,]')
+# Standart "HH:MM:SS,mmm" hızlı yolu
+_TIME_FAST = re.compile(r'(\d+):(\d+):(\d+),(\d+)')
+_LEADING_INT = re.compile(r'\d+')
+# Yazma tamponu (save_srt)
+_WRITE_BUFFER = 1 << 20
 
-@dataclass
+
+@dataclass(slots=True)
 class SubtitleBlock:
-    """Tek bir SRT bloğunu temsil eder."""
+    """Tek bir SRT bloğunu temsil eder (__slots__: blok başına __dict__ yok)."""
     index: int
     start_time: SubRipTime
     end_time: SubRipTime
@@ -23,18 +31,120 @@ class SubtitleBlock:
     char_count: int = field(init=False)
     
     def __post_init__(self):
-        # Karakter sayısını hesapla (boşluklar dahil, newline hariç)
-        self.char_count = len(self.text.replace('\n', ' '))
+        # Karakter sayısını hesapla (boşluklar dahil, newline boşluk sayılır)
+        # '\n' -> ' ' değişimi uzunluğu değiştirmez; kopya string gereksiz
+        self.char_count = len(self.text)
     
     def __repr__(self):
         return f"SubtitleBlock({self.index}: '{self.text[:30]}...' [{self.char_count} chars, {self.line_count} lines])"
 
 
+def _parse_time(source: str) -> Optional[SubRipTime]:
+    """
+    "HH:MM:SS,mmm" -> SubRipTime; geçersizse None.
+    pysrt'nin toleransını korur ('.' ayırıcı, sayı sonrası çöp karakterler).
+    """
+    match = _TIME_FAST.fullmatch(source)
+    if match:
+        return SubRipTime(*map(int, match.groups()))
+    
+    items = _TIME_SEP.split(source)
+    if len(items) != 4:
+        return None
+    values = []
+    for item in items:
+        digits = _LEADING_INT.match(item)
+        values.append(int(digits.group()) if digits else 0)
+    return SubRipTime(*values)
+
+
+def _format_time(time: SubRipTime) -> str:
+    """SubRipTime -> "HH:MM:SS,mmm" (pysrt ile aynı; negatif süre sıfır yazılır)."""
+    ordinal = max(time.ordinal, 0)
+    hours, rest = divmod(ordinal, 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    seconds, millis = divmod(rest, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def _iter_raw_blocks(lines: Iterable[str]) -> Iterator[List[str]]:
+    """Boş satırlarla ayrılmış satır gruplarını üretir."""
+    buffer: List[str] = []
+    for line in lines:
+        if line.strip():
+            buffer.append(line.rstrip())
+        elif buffer:
+            yield buffer
+            buffer = []
+    if buffer:
+        yield buffer
+
+
+def iter_srt(file_path: str) -> Iterator[SubtitleBlock]:
+    """
+    SRT dosyasını blok blok okur ve SubtitleBlock üretir (generator).
+    Dosyanın tamamı belleğe alınmaz; her blok parse edildiği anda döner.
+    UTF-8 BOM karakterini otomatik olarak temizler.
+    
+    pysrt nesneleri oluşturulmaz; satırlar doğrudan işlenir. Bozuk bloklar
+    pysrt'deki gibi sessizce atlanır.
+    
+    Args:
+        file_path: SRT dosyasının yolu
+        
+    Yields:
+        SubtitleBlock: Parse edilmiş alt yazı blokları (dosya sırasıyla)
+    """
+    # utf-8-sig encoding BOM karakterini otomatik temizler
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        i = 0
+        for lines in _iter_raw_blocks(f):
+            if len(lines) < 2:
+                continue
+            
+            # İlk satır zaman damgası değilse index satırıdır
+            raw_index = None
+            if '-->' not in lines[0]:
+                raw_index = lines.pop(0)
+            
+            timestamps = lines[0].split('-->')
+            if len(timestamps) != 2:
+                continue
+            start = _parse_time(timestamps[0].strip())
+            # Bitişten sonra gelebilecek pozisyon bilgisi (X1:...) atılır
+            end = _parse_time(timestamps[1].lstrip().split(' ', 1)[0].strip())
+            if start is None or end is None:
+                continue
+            
+            i += 1
+            original_text = '\n'.join(lines[1:]).strip()
+            # Orijinal satır sayısını kaydet
+            line_count = original_text.count('\n') + 1
+            
+            # İşleme için satır sonlarını boşluğa çevir (cümle birleştirme için)
+            # Ama line_count'u sakladık, çıktıda kullanacağız
+            text = original_text.replace('\n', ' ').strip()
+            
+            # Index'i normalize et (BOM veya bozuk karakterlerden temizle)
+            try:
+                clean_index = int(str(raw_index).strip().lstrip('\ufeff'))
+            except ValueError:
+                clean_index = i  # Fallback: sıra numarası kullan
+            
+            yield SubtitleBlock(
+                index=clean_index,
+                start_time=start,
+                end_time=end,
+                text=text,
+                line_count=line_count
+            )
+
+
 def parse_srt(file_path: str) -> List[SubtitleBlock]:
     """
     SRT dosyasını parse eder ve SubtitleBlock listesi döndürür.
     Orijinal satır yapısını korur.
-    UTF-8 BOM karakterini otomatik olarak temizler.
+    Akış halinde işlemek için iter_srt kullanın.
     
     Args:
         file_path: SRT dosyasının yolu
@@ -42,36 +152,16 @@ def parse_srt(file_path: str) -> List[SubtitleBlock]:
     Returns:
         List[SubtitleBlock]: Parse edilmiş alt yazı blokları
     """
-    # utf-8-sig encoding BOM karakterini otomatik temizler
-    subs = pysrt.open(file_path, encoding='utf-8-sig')
-    
-    blocks = []
-    for i, sub in enumerate(subs, start=1):
-        original_text = sub.text.strip()
-        # Orijinal satır sayısını kaydet
-        line_count = original_text.count('\n') + 1
-        
-        # İşleme için satır sonlarını boşluğa çevir (cümle birleştirme için)
-        # Ama line_count'u sakladık, çıktıda kullanacağız
-        text = original_text.replace('\n', ' ').strip()
-        
-        # Index'i normalize et (BOM veya bozuk karakterlerden temizle)
-        # pysrt bazen string döndürebilir, integer'a çevir
-        try:
-            clean_index = int(str(sub.index).strip().lstrip('\ufeff'))
-        except ValueError:
-            clean_index = i  # Fallback: sıra numarası kullan
-        
-        block = SubtitleBlock(
-            index=clean_index,
-            start_time=sub.start,
-            end_time=sub.end,
-            text=text,
-            line_count=line_count
-        )
-        blocks.append(block)
-    
-    return blocks
+    return list(iter_srt(file_path))
+
+
+def count_srt_blocks(file_path: str) -> int:
+    """
+    Zaman damgası satırlarını sayarak blok sayısını hızlıca bulur.
+    Tam parse yapmaz; akış halinde işlemede ilerleme hesabı için kullanılır.
+    """
+    with open(file_path, 'rb') as f:
+        return sum(1 for line in f if b'-->' in line)
 
 
 def format_text_with_lines(text: str, line_count: int) -> str:
@@ -91,27 +181,22 @@ def format_text_with_lines(text: str, line_count: int) -> str:
     text = text.strip()
     words = text.split()
     
-    if len(words) < line_count:
+    n_words = len(words)
+    
+    if n_words < line_count:
         # Yeterli kelime yoksa olduğu gibi döndür
         return text
     
-    # Kelimeleri eşit oranda satırlara böl
-    words_per_line = len(words) // line_count
-    remainder = len(words) % line_count
+    if line_count == 2:
+        # En yaygın durum: ilk satır fazla kelimeyi alır
+        mid = (n_words + 1) // 2
+        return ' '.join(words[:mid]) + '\n' + ' '.join(words[mid:])
     
-    lines = []
-    start = 0
+    # Kelimeleri eşit oranda satırlara böl (ilk `remainder` satır bir fazla alır)
+    words_per_line, remainder = divmod(n_words, line_count)
+    bounds = [i * words_per_line + min(i, remainder) for i in range(line_count + 1)]
     
-    for i in range(line_count):
-        # Her satıra kaç kelime
-        count = words_per_line + (1 if i < remainder else 0)
-        end = start + count
-        line = ' '.join(words[start:end])
-        if line:
-            lines.append(line)
-        start = end
-    
-    return '\n'.join(lines)
+    return '\n'.join(' '.join(words[bounds[i]:bounds[i + 1]]) for i in range(line_count))
 
 
 def save_srt(blocks: List[SubtitleBlock], output_path: str, translated_texts: List[str]) -> None:
@@ -123,21 +208,16 @@ def save_srt(blocks: List[SubtitleBlock], output_path: str, translated_texts: Li
         output_path: Çıktı dosya yolu
         translated_texts: Çevrilmiş metin listesi (block sırasına göre)
     """
-    subs = pysrt.SubRipFile()
-    
-    for block, translated_text in zip(blocks, translated_texts):
-        # Orijinal satır yapısını uygula
-        formatted_text = format_text_with_lines(translated_text, block.line_count)
-        
-        item = pysrt.SubRipItem(
-            index=block.index,
-            start=block.start_time,
-            end=block.end_time,
-            text=formatted_text
-        )
-        subs.append(item)
-    
-    subs.save(output_path, encoding='utf-8')
+    # Bloklar SubRipFile oluşturmadan doğrudan yazılır (pysrt ile aynı çıktı)
+    with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+        for block, translated_text in zip(blocks, translated_texts):
+            # Orijinal satır yapısını uygula
+            formatted_text = format_text_with_lines(translated_text, block.line_count)
+            
+            entry = (f"{block.index}\n{_format_time(block.start_time)} --> "
+                     f"{_format_time(block.end_time)}\n{formatted_text}\n")
+            # Blok zaten boş satırla bitiyorsa ayırıcı ekleme
+            f.write(entry if entry.endswith('\n\n') else entry + '\n')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+translation_cache.py - Persistent Translation Cache
+
+Çevrilmiş cümleleri SQLite üzerinde saklar; aynı cümle (aynı hedef dil)
+tekrar geldiğinde DeepL'e gitmeden döndürülür.
+Altyazılarda "Yes.", "No.", karakter isimleri gibi tekrarlar çok yaygındır.
+"""
+
+import os
+import time
+import tempfile
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+# Cache file path (config.json ile aynı dizinde)
+CACHE_FILE = 'translation_cache.sqlite'
+
+# Varsayılan yaşam süresi: 30 gün
+DEFAULT_TTL = 30 * 24 * 3600
+
+# LRU üst sınırı (satır sayısı)
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Eski kayıtları temizleme sıklığı (yazılan satır sayısı)
+TRIM_INTERVAL = 1000
+
+
+class TranslationCache:
+    """
+    (sha1(text), target_lang) -> çeviri eşlemesini tutan disk tabanlı LRU cache.
+
+    Her okuma `ts` sütununu günceller; TTL'i geçen kayıtlar okunmaz,
+    kapasite aşıldığında en eski kayıtlar silinir.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, ttl: int = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # İlk yazımda bir kez temizlik yap, sonra TRIM_INTERVAL satırda bir
+        self._writes_since_trim = TRIM_INTERVAL
+
+        with self._connect() as conn:
+            # WAL: okuyucular yazarı beklemez (kalıcı ayar, dosyada saklanır)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, value TEXT, ts INTEGER)"
+            )
+            # TTL ve LRU silmeleri ts üzerinden; tam tablo taraması yapılmasın
+            conn.execute("CREATE INDEX IF NOT EXISTS translations_ts ON translations(ts)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Her işlem için kısa ömürlü bağlantı - arka plan thread'lerinden güvenli kullanım
+        conn = sqlite3.connect(self.path, timeout=10)
+        # WAL ile güvenli; her commit'te fsync yapılmaz
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(text: str, target_lang: str) -> str:
+        """Cache anahtarı: sha1(target_lang + NUL + text)."""
+        return hashlib.sha1((target_lang + '\x00' + text).encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: Iterable[str], target_lang: str) -> Dict[str, str]:
+        """
+        Cache'te bulunan çevirileri döndürür.
+
+        Returns:
+            Dict[str, str]: Kaynak metin -> çeviri (sadece isabet edenler)
+        """
+        keys = {self.make_key(t, target_lang): t for t in texts}
+        if not keys:
+            return {}
+
+        now = int(time.time())
+        hits = {}
+
+        with self._lock, self._connect() as conn:
+            key_list = list(keys)
+            # SQLite değişken limiti (999) altında kal
+            for i in range(0, len(key_list), 500):
+                part = key_list[i:i + 500]
+                placeholders = ','.join('?' * len(part))
+                rows = conn.execute(
+                    f"SELECT key, value FROM translations WHERE key IN ({placeholders}) AND ts >= ?",
+                    part + [now - self.ttl]
+                ).fetchall()
+                for key, value in rows:
+                    hits[keys[key]] = value
+
+            # LRU: isabet edenlerin zamanını güncelle
+            if hits:
+                conn.executemany(
+                    "UPDATE translations SET ts = ? WHERE key = ?",
+                    [(now, self.make_key(t, target_lang)) for t in hits]
+                )
+
+        return hits
+
+    def put_many(self, translations: Dict[str, str], target_lang: str) -> None:
+        """Yeni çevirileri cache'e yazar; eski kayıtları periyodik olarak siler."""
+        if not translations:
+            return
+
+        now = int(time.time())
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, value, ts) VALUES (?, ?, ?)",
+                [(self.make_key(t, target_lang), v, now) for t, v in translations.items()]
+            )
+            self._writes_since_trim += len(translations)
+            if self._writes_since_trim >= TRIM_INTERVAL:
+                self._writes_since_trim = 0
+                self._trim(conn, now)
+
+    def _trim(self, conn: sqlite3.Connection, now: int) -> None:
+        """TTL'i geçen kayıtları, kapasite aşıldıysa en eskileri siler."""
+        conn.execute("DELETE FROM translations WHERE ts < ?", (now - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                "SELECT key FROM translations ORDER BY ts ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        """Tüm cache'i temizler."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM translations")
+
+
+# Singleton instance
+_cache = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Get the singleton TranslationCache instance."""
+    global _cache
+    if _cache is None:
+        _cache = TranslationCache()
+    return _cache
+
+
+if __name__ == "__main__":
+    # Test kodu
+    cache = TranslationCache(path=os.path.join(tempfile.gettempdir(), 'srt_cache_test.sqlite'))
+    cache.put_many({"Yes.": "Evet.", "No.": "Hayır."}, "TR")
+    print(cache.get_many(["Yes.", "No.", "Maybe."], "TR"))
+    print(cache.get_many(["Yes."], "DE"))
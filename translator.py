@@ -7,74 +7,279 @@ API key config.json dosyasından okunur.
 """
 
 import os
-import json
-import requests
-from typing import List, Optional
+import gzip
+import queue
+import hashlib
+import time
+import random
+import asyncio
+import importlib.util
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, chain
+
+from cachetools import LRUCache
+
+from translation_cache import get_translation_cache
+
+# HTTP istemcileri ilk istekte yüklenir: requests (urllib3, idna,
+# charset-normalizer) ve aiohttp import sırasında pahalıdır; MockTranslator
+# ve sadece TranslationConfig kullanan yollar bu maliyeti ödemez
+AIOHTTP_AVAILABLE = importlib.util.find_spec("aiohttp") is not None
+_requests = None
+_aiohttp = None
+
+
+def _get_requests():
+    """requests modülünü ilk kullanımda içe aktarır."""
+    global _requests
+    if _requests is None:
+        import requests
+        _requests = requests
+    return _requests
+
+
+def _get_aiohttp():
+    """aiohttp modülünü ilk kullanımda içe aktarır."""
+    global _aiohttp
+    if _aiohttp is None:
+        import aiohttp
+        _aiohttp = aiohttp
+    return _aiohttp
+
 
 # Config file path
 CONFIG_FILE = 'config.json'
 
+# DeepL istek sınırları: en fazla 50 metin, gövde boyutu için ~30 KB güvenli sınır
+MAX_TEXTS_PER_REQUEST = 50
+MAX_REQUEST_BYTES = 30_000
+
+# Büyük istek gövdeleri gzip ile sıkıştırılır (isteğe bağlı: SRT_GZIP_REQUESTS=1)
+GZIP_REQUESTS = os.environ.get("SRT_GZIP_REQUESTS", "0") == "1"
+GZIP_MIN_BYTES = 4096
+
+# translate_batch'te parçaları aynı anda gönderen thread sayısı
+CHUNK_WORKERS = 4
+
+# translate_text için örnek başına bellek içi LRU boyutu
+TEXT_MEMO_SIZE = 4096
+
+# Geçici hatalarda yeniden deneme (429 rate limit, 5xx, timeout)
+_RETRYABLE = frozenset({408, 429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
 
+
+@lru_cache(maxsize=1)
 def load_api_key_from_config() -> str:
-    """Load API key from config.json."""
+    """Load API key from config.json (read once; see invalidate_config_cache)."""
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                config = orjson.loads(f.read())
                 return config.get('deepl_api_key', '')
         except:
             pass
     return ''
 
 
-@dataclass
+def invalidate_config_cache() -> None:
+    """Drop the cached API key after config.json changes (Web UI settings)."""
+    load_api_key_from_config.cache_clear()
+
+
+@dataclass(slots=True, frozen=True)
 class TranslationConfig:
-    """Çeviri konfigürasyonu."""
+    """Çeviri konfigürasyonu (değiştirilemez, hash'lenebilir; değişiklik için dataclasses.replace)."""
     source_lang: Optional[str] = None  # None = auto-detect (recommended)
     target_lang: str = "TR"
     formality: str = "default"  # "more", "less", "default", "prefer_more", "prefer_less"
     preserve_formatting: bool = True
 
 
+def _split_non_empty(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """Boş metinleri filtreler; (dolu metinler, orijinal indeksler) döndürür."""
+    # `text and` boş string'lerde (SRT boşlukları) strip() çağrısını atlar
+    pairs = [(i, text) for i, text in enumerate(texts) if text and text.strip()]
+    if not pairs:
+        return [], []
+    
+    original_indices, non_empty_texts = map(list, zip(*pairs))
+    return non_empty_texts, original_indices
+
+
+def _place_translations(count: int, original_indices: List[int], result: dict) -> List[str]:
+    """API sonuçlarını orijinal sıraya yerleştirir (boşlar "" kalır)."""
+    translated = [""] * count
+    
+    if "translations" in result:
+        for i, translation in enumerate(result["translations"]):
+            original_idx = original_indices[i]
+            translated[original_idx] = translation["text"]
+    
+    return translated
+
+
+def _chunk_texts(texts: List[str], chunk_size: int = MAX_TEXTS_PER_REQUEST,
+                 max_bytes: int = MAX_REQUEST_BYTES) -> List[List[str]]:
+    """Metinleri sırayı koruyarak istek sınırlarına uyan parçalara böler."""
+    chunks = []
+    current = []
+    current_bytes = 0
+    
+    for text in texts:
+        size = len(text.encode('utf-8'))
+        if current and (len(current) >= chunk_size or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current = []
+            current_bytes = 0
+        current.append(text)
+        current_bytes += size
+    
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def cache_scope(config: TranslationConfig) -> str:
+    """
+    TranslationCache anahtarının dil kısmı. Varsayılan ayarlarda sadece hedef
+    dildir; kaynak dil, formality ve biçim koruma değiştiyse anahtara eklenir.
+    """
+    scope = config.target_lang
+    if config.source_lang:
+        scope += f"|src={config.source_lang}"
+    if config.formality != "default":
+        scope += f"|formality={config.formality}"
+    if not config.preserve_formatting:
+        scope += "|preserve_formatting=0"
+    return scope
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Üstel bekleme + jitter; sunucu Retry-After verdiyse en az o kadar beklenir.
+    Retry-After da RETRY_MAX_DELAY ile sınırlanır (iş thread'i saatlerce bloklanmasın).
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * (1 + random.uniform(0, RETRY_JITTER))
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), RETRY_MAX_DELAY))
+        except ValueError:
+            pass  # HTTP-date biçimi: hesaplanan gecikme kullanılır
+    return delay
+
+
+def _place_cached(count: int, original_indices: List[int], non_empty_texts: List[str],
+                  translations: dict) -> List[str]:
+    """Metin -> çeviri eşlemesini orijinal sıraya yerleştirir (boşlar "" kalır)."""
+    translated = [""] * count
+    for original_idx, text in zip(original_indices, non_empty_texts):
+        translated[original_idx] = translations.get(text, "")
+    return translated
+
+
+def _encode_body(payload: dict) -> Tuple[bytes, dict]:
+    """
+    Payload'ı JSON byte'larına çevirir; GZIP_REQUESTS açıksa ve gövde
+    GZIP_MIN_BYTES'tan büyükse sıkıştırır. (gövde, ek header'lar) döndürür.
+    
+    Idempotency-Key gövdenin sha256'sıdır: aynı isteğin yeniden denemeleri
+    aynı anahtarı taşır, destekleyen ağ geçitleri kotayı iki kez saymaz.
+    """
+    body = orjson.dumps(payload)
+    headers = {"Idempotency-Key": hashlib.sha256(body).hexdigest()}
+    if GZIP_REQUESTS and len(body) > GZIP_MIN_BYTES:
+        # Seviye 1: doğal dil metninde oranın çoğu, CPU maliyeti ihmal edilebilir
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+async def create_session(limit: int = 16) -> "aiohttp.ClientSession":
+    """
+    atranslate_batch için paylaşılan aiohttp oturumu açar (keep-alive, DNS cache).
+    Event loop içinde çağrılmalı; iş bitince session.close() ile kapatılmalı.
+    """
+    aiohttp = _get_aiohttp()
+    connector = aiohttp.TCPConnector(limit=limit, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector)
+
+
 class DeepLTranslator:
     """DeepL Free API ile çeviri yapan sınıf (Direct HTTP)."""
     
     # DeepL Free API endpoint - :fx ile biten keyler için zorunlu
     BASE_URL = "https://api-free.deepl.com/v2/translate"
     
+    # Formality sadece desteklenen dillerde kullanılabilir (TR desteklemiyor)
+    _FORMALITY_LANGS = frozenset({"DE", "FR", "IT", "ES", "NL", "PL", "PT-PT", "PT-BR", "RU", "JA"})
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Args:
             api_key: DeepL API anahtarı. Verilmezse config.json'dan okunur.
         """
         self.api_key = api_key or load_api_key_from_config()
-
         
-    def _make_request(self, texts: List[str], config: TranslationConfig) -> dict:
+        # Keep-alive bağlantı havuzu (_get_session ile ilk istekte açılır)
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # (metin, config) -> çeviri; aynı çalışmada tekrarlanan kısa metinler için
+        self._memo: LRUCache = LRUCache(maxsize=TEXT_MEMO_SIZE)
+    
+    def _auth_headers(self) -> dict:
+        return {
+            "Authorization": f"DeepL-Auth-Key {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _get_session(self):
+        """requests oturumunu ilk istekte açar; sonraki çağrılar aynı bağlantıları kullanır."""
+        with self._session_lock:
+            if self._session is None:
+                requests = _get_requests()
+                session = requests.Session()
+                session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+                if self.api_key:
+                    session.headers.update(self._auth_headers())
+                self._session = session
+            return self._session
+    
+    def close(self) -> None:
+        """HTTP oturumunu ve havuzdaki bağlantıları kapatır."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def __enter__(self) -> "DeepLTranslator":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _build_request(self, texts: List[str], config: TranslationConfig) -> Tuple[dict, dict]:
         """
-        DeepL API'ye HTTP POST isteği gönderir.
+        DeepL isteği için header ve payload oluşturur (sync ve async ortak).
         
-        Args:
-            texts: Çevrilecek metin listesi
-            config: Çeviri konfigürasyonu
-            
-        Returns:
-            API response JSON
-            
         Raises:
             ValueError: API key eksikse
-            requests.HTTPError: API hatası
         """
         if not self.api_key:
             raise ValueError(
                 "DeepL API key required. Please add your API key via the Web UI settings."
             )
         
-        headers = {
-            "Authorization": f"DeepL-Auth-Key {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers()
         
         payload = {
             "text": texts,
@@ -88,20 +293,51 @@ class DeepLTranslator:
         if config.source_lang:
             payload["source_lang"] = config.source_lang
         
-        # Formality sadece desteklenen dillerde kullanılabilir
-        # TR desteklemiyor, bu yüzden sadece destekleyenler için ekle
-        formality_supported = ["DE", "FR", "IT", "ES", "NL", "PL", "PT-PT", "PT-BR", "RU", "JA"]
-        if config.target_lang in formality_supported and config.formality != "default":
+        # Formality sadece destekleyen diller için eklenir
+        if config.target_lang in self._FORMALITY_LANGS and config.formality != "default":
             payload["formality"] = config.formality
         
-        response = requests.post(self.BASE_URL, headers=headers, json=payload, timeout=30)
+        return headers, payload
+    
+    def _make_request(self, texts: List[str], config: TranslationConfig) -> dict:
+        """
+        DeepL API'ye HTTP POST isteği gönderir.
         
-        # Hata kontrolü
-        if response.status_code != 200:
-            error_msg = f"DeepL API Error {response.status_code}: {response.text}"
-            raise requests.HTTPError(error_msg, response=response)
+        Args:
+            texts: Çevrilecek metin listesi
+            config: Çeviri konfigürasyonu
+            
+        Returns:
+            API response JSON
+            
+        Raises:
+            ValueError: API key eksikse
+            requests.HTTPError: API hatası (geçici hatalarda MAX_RETRIES denemeden sonra)
+        """
+        # Yetkilendirme header'ları oturumda tanımlı (_get_session); sadece payload gönderilir
+        _, payload = self._build_request(texts, config)
+        body, extra_headers = _encode_body(payload)
+        requests = _get_requests()
+        session = self._get_session()
         
-        return response.json()
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = session.post(self.BASE_URL, data=body, headers=extra_headers, timeout=30)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(_retry_delay(attempt))
+                continue
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            
+            # Hata kontrolü: 429/5xx dışındaki hatalar (403, 456 kota...) hemen yükseltilir
+            if response.status_code not in _RETRYABLE or attempt == MAX_RETRIES:
+                error_msg = f"DeepL API Error {response.status_code}: {response.text}"
+                raise requests.HTTPError(error_msg, response=response)
+            
+            time.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
     
     def translate_text(self, text: str, config: Optional[TranslationConfig] = None) -> str:
         """
@@ -118,6 +354,15 @@ class DeepLTranslator:
             return ""
             
         config = config or TranslationConfig()
+        key = (text, config)
+        translated = self._memo.get(key)
+        if translated is None:
+            translated = self._request_single(text, config)
+            self._memo[key] = translated
+        
+        return translated
+    
+    def _request_single(self, text: str, config: TranslationConfig) -> str:
         result = self._make_request([text], config)
         
         if "translations" in result and len(result["translations"]) > 0:
@@ -125,13 +370,38 @@ class DeepLTranslator:
         
         return ""
     
-    def translate_batch(self, texts: List[str], config: Optional[TranslationConfig] = None) -> List[str]:
+    def _request_chunks(self, texts: List[str], config: TranslationConfig) -> dict:
+        """
+        Metinleri DeepL sınırlarına uyan parçalara bölüp çevirir; birden fazla
+        parça varsa CHUNK_WORKERS thread ile aynı oturum üzerinden gönderilir.
+        
+        Returns:
+            dict: Metin -> çeviri
+        """
+        def request_chunk(chunk):
+            result = self._make_request(chunk, config)
+            return [t["text"] for t in result.get("translations", [])]
+        
+        chunks = _chunk_texts(texts)
+        if len(chunks) == 1:
+            results = [request_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(CHUNK_WORKERS, len(chunks))) as executor:
+                results = list(executor.map(request_chunk, chunks))
+        
+        # executor.map sırayı korur; parçalar birleştirilince texts sırası elde edilir
+        return dict(zip(texts, chain.from_iterable(results)))
+    
+    def translate_batch(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                        disable_cache: bool = False) -> List[str]:
         """
-        Birden fazla metni toplu çevirir (tek API çağrısı - optimize).
+        Birden fazla metni toplu çevirir (DeepL sınırlarına göre parçalı, eşzamanlı).
+        Cache'te bulunan metinler (TranslationCache) API'ye gönderilmez.
         
         Args:
             texts: Çevrilecek metin listesi
             config: Çeviri konfigürasyonu
+            disable_cache: True ise cache okunmaz/yazılmaz
             
         Returns:
             Çevrilmiş metin listesi (aynı sırada)
@@ -140,31 +410,171 @@ class DeepLTranslator:
             return []
             
         config = config or TranslationConfig()
+        non_empty_texts, original_indices = _split_non_empty(texts)
+        
+        if not non_empty_texts:
+            return [""] * len(texts)
+        
+        if disable_cache:
+            # Tekrarlanan metinler bir kez gönderilir
+            translations = self._request_chunks(list(dict.fromkeys(non_empty_texts)), config)
+            return _place_cached(len(texts), original_indices, non_empty_texts, translations)
+        
+        cache = get_translation_cache()
+        scope = cache_scope(config)
+        translations = cache.get_many(non_empty_texts, scope)
+        misses = [t for t in dict.fromkeys(non_empty_texts) if t not in translations]
+        
+        if misses:
+            # Sadece cache'te olmayanlar çevrilir
+            fresh = self._request_chunks(misses, config)
+            cache.put_many(fresh, scope)
+            translations.update(fresh)
+        
+        return _place_cached(len(texts), original_indices, non_empty_texts, translations)
+    
+    def translate_batch_iter(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                             chunk_size: int = MAX_TEXTS_PER_REQUEST,
+                             ordered: bool = True) -> Iterator[Tuple[List[int], List[str]]]:
+        """
+        Metinleri parçalar halinde arka planda çevirir ve her parça bittiğinde
+        sonucunu üretir; çağıran taraf (ör. SRT yazımı) ağ beklemesiyle paralel çalışır.
+        Her parça translate_batch ile çevrilir (cache, tekrar eleme, yeniden deneme).
+        
+        Args:
+            texts: Çevrilecek metin listesi
+            config: Çeviri konfigürasyonu
+            chunk_size: Parça başına en fazla metin sayısı
+            ordered: True ise parçalar texts sırasıyla, False ise bittikleri sırayla üretilir
+            
+        Yields:
+            (orijinal indeksler, çeviriler) ikilisi
+        """
+        if not texts:
+            return
+        
+        config = config or TranslationConfig()
+        chunks = _chunk_texts(texts, chunk_size)
+        starts = list(accumulate((len(chunk) for chunk in chunks[:-1]), initial=0))
         
-        # Boş metinleri filtrele ve indekslerini tut
-        non_empty_texts = []
-        original_indices = []
+        with ThreadPoolExecutor(max_workers=min(CHUNK_WORKERS, len(chunks))) as executor:
+            futures = {
+                executor.submit(self.translate_batch, chunk, config): list(range(start, start + len(chunk)))
+                for chunk, start in zip(chunks, starts)
+            }
+            # dict ekleme sırası = gönderim sırası; sıralı modda bitmeyen parça beklenir
+            for future in (futures if ordered else as_completed(futures)):
+                yield futures[future], future.result()
+    
+    async def atranslate_batch(self, session: "aiohttp.ClientSession", texts: List[str],
+                               config: Optional[TranslationConfig] = None) -> List[str]:
+        """
+        translate_batch'in asyncio sürümü (aiohttp).
+        Aynı session ile eşzamanlı çağrılar tek bağlantı havuzunu paylaşır,
+        böylece her batch için yeniden TCP/TLS el sıkışması yapılmaz.
         
-        for i, text in enumerate(texts):
-            if text.strip():
-                non_empty_texts.append(text)
-                original_indices.append(i)
+        Args:
+            session: create_session() ile açılmış oturum
+            texts: Çevrilecek metin listesi
+            config: Çeviri konfigürasyonu
+            
+        Returns:
+            Çevrilmiş metin listesi (aynı sırada)
+        """
+        if not texts:
+            return []
+        
+        config = config or TranslationConfig()
+        non_empty_texts, original_indices = _split_non_empty(texts)
         
         if not non_empty_texts:
             return [""] * len(texts)
         
-        # Tek API çağrısı ile toplu çeviri
-        result = self._make_request(non_empty_texts, config)
+        headers, payload = self._build_request(non_empty_texts, config)
+        body, extra_headers = _encode_body(payload)
+        headers.update(extra_headers)
+        aiohttp = _get_aiohttp()
         
-        # Sonuçları orijinal sıraya yerleştir
-        translated = [""] * len(texts)
+        # _make_request ile aynı yeniden deneme kuralları
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.post(self.BASE_URL, headers=headers, data=body,
+                                        timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    if response.status == 200:
+                        result = orjson.loads(await response.read())
+                        break
+                    if response.status not in _RETRYABLE or attempt == MAX_RETRIES:
+                        error_msg = f"DeepL API Error {response.status}: {await response.text()}"
+                        raise _get_requests().HTTPError(error_msg)
+                    delay = _retry_delay(attempt, response.headers.get("Retry-After"))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = _retry_delay(attempt)
+            await asyncio.sleep(delay)
         
-        if "translations" in result:
-            for i, translation in enumerate(result["translations"]):
-                original_idx = original_indices[i]
-                translated[original_idx] = translation["text"]
+        return _place_translations(len(texts), original_indices, result)
+    
+    async def translate_batch_async(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                                    chunk_size: int = MAX_TEXTS_PER_REQUEST,
+                                    concurrency: int = 8, disable_cache: bool = False) -> List[str]:
+        """
+        Uzun metin listelerini DeepL sınırlarına uyan parçalara bölüp
+        eşzamanlı çevirir (en fazla `concurrency` istek aynı anda).
+        Cache'te bulunan metinler (TranslationCache) API'ye gönderilmez.
         
-        return translated
+        Args:
+            texts: Çevrilecek metin listesi
+            config: Çeviri konfigürasyonu
+            chunk_size: İstek başına en fazla metin sayısı
+            concurrency: Aynı anda açık istek sayısı
+            disable_cache: True ise cache okunmaz/yazılmaz
+            
+        Returns:
+            Çevrilmiş metin listesi (aynı sırada)
+        """
+        if not texts:
+            return []
+        
+        config = config or TranslationConfig()
+        non_empty_texts, original_indices = _split_non_empty(texts)
+        
+        if not non_empty_texts:
+            return [""] * len(texts)
+        
+        cache = None if disable_cache else get_translation_cache()
+        scope = cache_scope(config)
+        translations = cache.get_many(non_empty_texts, scope) if cache else {}
+        misses = [t for t in dict.fromkeys(non_empty_texts) if t not in translations]
+        
+        if misses:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def translate_chunk(session, chunk):
+                async with semaphore:
+                    return await self.atranslate_batch(session, chunk, config)
+            
+            session = await create_session(limit=concurrency)
+            try:
+                results = await asyncio.gather(
+                    *(translate_chunk(session, chunk) for chunk in _chunk_texts(misses, chunk_size))
+                )
+            finally:
+                await session.close()
+            
+            # Parçalar sırayla birleştirilince misses sırası korunur
+            fresh = dict(zip(misses, chain.from_iterable(results)))
+            if cache:
+                cache.put_many(fresh, scope)
+            translations.update(fresh)
+        
+        return _place_cached(len(texts), original_indices, non_empty_texts, translations)
+    
+    def translate_batch_parallel(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                                 chunk_size: int = MAX_TEXTS_PER_REQUEST,
+                                 concurrency: int = 8, disable_cache: bool = False) -> List[str]:
+        """translate_batch_async'in senkron sarmalayıcısı (çalışan event loop dışında çağrılmalı)."""
+        return asyncio.run(self.translate_batch_async(texts, config, chunk_size, concurrency, disable_cache))
     
     def test_connection(self) -> dict:
         """
@@ -174,7 +584,8 @@ class DeepLTranslator:
             dict: Başarılıysa {"success": True, "message": "..."}, değilse {"success": False, "error": "..."}
         """
         try:
-            result = self.translate_text("Hello", TranslationConfig(target_lang="TR"))
+            # Bellek içi memo atlanır: her test gerçek bir istek gönderir
+            result = self._request_single("Hello", TranslationConfig(target_lang="TR"))
             return {
                 "success": True,
                 "message": f"API connection successful! 'Hello' → '{result}'",
@@ -206,6 +617,107 @@ def translate_sentences(sentences: List[str],
     return translator.translate_batch(sentences, config)
 
 
+def _queue_put(q: queue.Queue, item, abort: threading.Event) -> bool:
+    """Kuyruk doluyken abort'u kontrol ederek bekler; iptal edildiyse False."""
+    while not abort.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _queue_get(q: queue.Queue, abort: threading.Event, default):
+    """Kuyruk boşken abort'u kontrol ederek bekler; iptal edildiyse default döner."""
+    while not abort.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return default
+
+
+def translate_sentences_streaming(sentence_iter: Iterable[str],
+                                  target_lang: str = "TR",
+                                  api_key: Optional[str] = None,
+                                  chunk_size: int = MAX_TEXTS_PER_REQUEST) -> Iterator[Tuple[int, str]]:
+    """
+    Cümleleri akış halinde çevirir (producer/consumer).
+    
+    sentence_iter bir thread'de okunur (ör. SRT parse + cümle birleştirme),
+    ikinci bir thread chunk_size'lık gruplar halinde translate_batch çağırır;
+    çağıran taraf sonuçları geldikçe tüketir. Üç aşama aynı anda çalışır.
+    
+    Args:
+        sentence_iter: Çevrilecek cümleler (generator olabilir)
+        target_lang: Hedef dil kodu
+        api_key: DeepL API key (opsiyonel)
+        chunk_size: API çağrısı başına cümle sayısı
+        
+    Yields:
+        (cümlenin sentence_iter'deki sırası, çeviri) - giriş sırasıyla
+    """
+    translator = DeepLTranslator(api_key)
+    config = TranslationConfig(target_lang=target_lang)
+    
+    done = object()
+    in_q: queue.Queue = queue.Queue(maxsize=chunk_size * 4)
+    out_q: queue.Queue = queue.Queue(maxsize=chunk_size * 4)
+    abort = threading.Event()
+    errors = []
+    
+    def feed():
+        try:
+            for item in enumerate(sentence_iter):
+                if not _queue_put(in_q, item, abort):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _queue_put(in_q, done, abort)
+    
+    def translate():
+        try:
+            finished = False
+            while not finished:
+                batch = []
+                while len(batch) < chunk_size:
+                    item = _queue_get(in_q, abort, done)
+                    if item is done:
+                        finished = True
+                        break
+                    batch.append(item)
+                if not batch or errors:
+                    continue
+                
+                translated = translator.translate_batch([text for _, text in batch], config)
+                for (idx, _), text in zip(batch, translated):
+                    if not _queue_put(out_q, (idx, text), abort):
+                        return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _queue_put(out_q, done, abort)
+    
+    threads = [threading.Thread(target=feed, daemon=True), threading.Thread(target=translate, daemon=True)]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        while True:
+            item = out_q.get()
+            if item is done:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        # Tüketici erken bırakırsa thread'ler kuyrukta takılı kalmaz
+        abort.set()
+        translator.close()
+
+
 class MockTranslator:
     """
     Test amaçlı mock translator.
@@ -216,9 +728,27 @@ class MockTranslator:
         """Basit mock çeviri - sadece [TR] prefix ekler."""
         return f"[TR] {text}"
     
-    def translate_batch(self, texts: List[str], config: Optional[TranslationConfig] = None) -> List[str]:
-        """Toplu mock çeviri."""
+    def translate_batch(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                        disable_cache: bool = False) -> List[str]:
+        """Toplu mock çeviri (cache kullanılmaz)."""
         return [self.translate_text(t, config) for t in texts]
+    
+    async def atranslate_batch(self, session, texts: List[str], config: Optional[TranslationConfig] = None) -> List[str]:
+        """Toplu mock çeviri (async)."""
+        return self.translate_batch(texts, config)
+    
+    def translate_batch_parallel(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                                 chunk_size: int = MAX_TEXTS_PER_REQUEST, concurrency: int = 8,
+                                 disable_cache: bool = False) -> List[str]:
+        """Toplu mock çeviri (parçalı API ile uyumlu)."""
+        return self.translate_batch(texts, config)
+    
+    def translate_batch_iter(self, texts: List[str], config: Optional[TranslationConfig] = None,
+                             chunk_size: int = MAX_TEXTS_PER_REQUEST,
+                             ordered: bool = True) -> Iterator[Tuple[List[int], List[str]]]:
+        """Parçalı mock çeviri (tek parça)."""
+        if texts:
+            yield list(range(len(texts))), self.translate_batch(texts, config)
 
 
 if __name__ == "__main__":